@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Tuple
+
+from backend.heuristics import ssl_heuristics
+from backend.utils import dns_utils, whois_utils
+from backend.utils.ttl_cache import TTLCache, ttl_from_env
+
+
+# Per-type TTLs roughly follow how quickly the underlying evidence changes:
+# DNS answers are commonly cached for an hour, RDAP/ASN data is stable, URLs redirect/expire fastest.
+DOMAIN_CACHE = TTLCache(maxsize=2048, ttl_seconds=ttl_from_env(3600))
+IP_CACHE = TTLCache(maxsize=2048, ttl_seconds=ttl_from_env(1800))
+URL_CACHE = TTLCache(maxsize=2048, ttl_seconds=ttl_from_env(600))
+
+
+def retarget(
+    entry: Tuple[Dict[str, Any], Dict[str, Any]], target: str
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Return a cached (result, explain) pair labelled with the caller's original target.
+
+    Cache keys are normalized, so the same entry can serve differently-spelled inputs.
+    """
+
+    result, explain = entry
+    return {**result, "target": target}, {**explain, "target": target}
+
+
+def cache_status() -> Dict[str, Any]:
+    return {
+        "domain": DOMAIN_CACHE.stats(),
+        "ip": IP_CACHE.stats(),
+        "url": URL_CACHE.stats(),
+        "dns": dns_utils.cache_stats(),
+        "whois": whois_utils.cache_stats(),
+        "tls_cert": ssl_heuristics.cache_stats(),
+    }
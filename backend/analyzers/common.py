@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+from backend.core.scorer import score_signals_detailed
+from backend.core.signal import Signal
+from backend.core.verdict import verdict_for_score
+
+
+def build_entry(
+    target: str, target_type: str, signals: List[Signal], want_explain: bool = True
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Score signals into the (result, explain) pair shared by all analyzers.
+
+    `explain` references the same signal list and breakdown dict as `result` (nothing is copied);
+    it is left empty when the caller doesn't need the scoring math.
+    """
+
+    risk_score, confidence, breakdown, scoring_math = score_signals_detailed(signals, want_explain=want_explain)
+    signal_dicts = [s.to_dict() for s in signals]
+
+    result: Dict[str, Any] = {
+        "target": target,
+        "type": target_type,
+        "risk_score": risk_score,
+        "confidence": confidence,
+        "verdict": verdict_for_score(risk_score),
+        "signals": signal_dicts,
+        "breakdown": breakdown,
+    }
+
+    if not want_explain:
+        return result, {}
+
+    explain = {
+        "target": target,
+        "type": target_type,
+        "signals": signal_dicts,
+        "breakdown": breakdown,
+        "scoring": scoring_math,
+    }
+
+    return result, explain
@@ -2,65 +2,39 @@
 
 from typing import Any, Dict, Tuple
 
-from backend.core.scorer import score_signals_detailed
-from backend.core.verdict import verdict_for_score
+from backend.analyzers.cache import DOMAIN_CACHE, retarget
+from backend.analyzers.common import build_entry
 from backend.heuristics.domain_heuristics import domain_signals, domain_signals_async
 from backend.utils.validators import normalize_domain
 
 
 def analyze_domain_explain(domain: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     d = normalize_domain(domain)
-    signals = domain_signals(d)
 
-    risk_score, confidence, breakdown, scoring_math = score_signals_detailed(signals)
+    entry = DOMAIN_CACHE.get(d)
+    if entry is None:
+        entry = build_entry(domain, "domain", domain_signals(d))
+        DOMAIN_CACHE.set(d, entry)
 
-    result: Dict[str, Any] = {
-        "target": domain,
-        "type": "domain",
-        "risk_score": risk_score,
-        "confidence": confidence,
-        "verdict": verdict_for_score(risk_score),
-        "signals": signals,
-        "breakdown": breakdown,
-    }
-
-    explain = {
-        "target": domain,
-        "type": "domain",
-        "signals": signals,
-        "breakdown": breakdown,
-        "scoring": scoring_math,
-    }
-
-    return result, explain
+    return retarget(entry, domain)
 
 
 async def analyze_domain_explain_async(domain: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     d = normalize_domain(domain)
-    signals = await domain_signals_async(d)
 
-    risk_score, confidence, breakdown, scoring_math = score_signals_detailed(signals)
+    async def compute() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        return build_entry(domain, "domain", await domain_signals_async(d))
 
-    result: Dict[str, Any] = {
-        "target": domain,
-        "type": "domain",
-        "risk_score": risk_score,
-        "confidence": confidence,
-        "verdict": verdict_for_score(risk_score),
-        "signals": signals,
-        "breakdown": breakdown,
-    }
+    entry = await DOMAIN_CACHE.get_or_compute_async(d, compute)
+    return retarget(entry, domain)
 
-    explain = {
-        "target": domain,
-        "type": "domain",
-        "signals": signals,
-        "breakdown": breakdown,
-        "scoring": scoring_math,
-    }
 
-    return result, explain
+def analyze_domain(domain: str) -> Dict[str, Any]:
+    d = normalize_domain(domain)
 
+    entry = DOMAIN_CACHE.get(d)
+    if entry is not None:
+        return retarget(entry, domain)[0]
 
-def analyze_domain(domain: str) -> Dict[str, Any]:
-    return analyze_domain_explain(domain)[0]
+    # Cache entries carry the full explain blob, so a miss here computes without it and isn't cached.
+    return build_entry(domain, "domain", domain_signals(d), want_explain=False)[0]
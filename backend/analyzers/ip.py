@@ -2,65 +2,39 @@
 
 from typing import Any, Dict, Tuple
 
-from backend.core.scorer import score_signals_detailed
-from backend.core.verdict import verdict_for_score
+from backend.analyzers.cache import IP_CACHE, retarget
+from backend.analyzers.common import build_entry
 from backend.heuristics.ip_heuristics import ip_signals, ip_signals_async
 from backend.utils.validators import normalize_ip
 
 
 def analyze_ip_explain(ip: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     ipn = normalize_ip(ip)
-    signals = ip_signals(ipn)
 
-    risk_score, confidence, breakdown, scoring_math = score_signals_detailed(signals)
+    entry = IP_CACHE.get(ipn)
+    if entry is None:
+        entry = build_entry(ip, "ip", ip_signals(ipn))
+        IP_CACHE.set(ipn, entry)
 
-    result: Dict[str, Any] = {
-        "target": ip,
-        "type": "ip",
-        "risk_score": risk_score,
-        "confidence": confidence,
-        "verdict": verdict_for_score(risk_score),
-        "signals": signals,
-        "breakdown": breakdown,
-    }
-
-    explain = {
-        "target": ip,
-        "type": "ip",
-        "signals": signals,
-        "breakdown": breakdown,
-        "scoring": scoring_math,
-    }
-
-    return result, explain
+    return retarget(entry, ip)
 
 
 async def analyze_ip_explain_async(ip: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     ipn = normalize_ip(ip)
-    signals = await ip_signals_async(ipn)
 
-    risk_score, confidence, breakdown, scoring_math = score_signals_detailed(signals)
+    async def compute() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        return build_entry(ip, "ip", await ip_signals_async(ipn))
 
-    result: Dict[str, Any] = {
-        "target": ip,
-        "type": "ip",
-        "risk_score": risk_score,
-        "confidence": confidence,
-        "verdict": verdict_for_score(risk_score),
-        "signals": signals,
-        "breakdown": breakdown,
-    }
+    entry = await IP_CACHE.get_or_compute_async(ipn, compute)
+    return retarget(entry, ip)
 
-    explain = {
-        "target": ip,
-        "type": "ip",
-        "signals": signals,
-        "breakdown": breakdown,
-        "scoring": scoring_math,
-    }
 
-    return result, explain
+def analyze_ip(ip: str) -> Dict[str, Any]:
+    ipn = normalize_ip(ip)
 
+    entry = IP_CACHE.get(ipn)
+    if entry is not None:
+        return retarget(entry, ip)[0]
 
-def analyze_ip(ip: str) -> Dict[str, Any]:
-    return analyze_ip_explain(ip)[0]
+    # Cache entries carry the full explain blob, so a miss here computes without it and isn't cached.
+    return build_entry(ip, "ip", ip_signals(ipn), want_explain=False)[0]
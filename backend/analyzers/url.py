@@ -1,97 +1,103 @@
 ﻿from __future__ import annotations
 
 import asyncio
+import logging
 from typing import Any, Dict, List, Tuple
 
-from backend.core.scorer import score_signals_detailed
-from backend.core.verdict import verdict_for_score
+from backend.analyzers.cache import URL_CACHE, retarget
+from backend.analyzers.common import build_entry
+from backend.core.signal import Signal
 from backend.heuristics.domain_heuristics import domain_signals, domain_signals_async
 from backend.heuristics.ip_heuristics import ip_signals, ip_signals_async
 from backend.heuristics.url_heuristics import url_signals, url_signals_async
-from backend.utils.validators import is_ip, parse_url_loose
+from backend.utils.logging_utils import target_fingerprint
+from backend.utils.validators import normalize_url, parse_url_loose
+
+
+logger = logging.getLogger("security_analyzer")
 
 
 def analyze_url_explain(url: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    _, parsed = parse_url_loose(url)
-    host = (parsed.hostname or "").strip("[]")
+    key = normalize_url(url)
+
+    entry = URL_CACHE.get(key)
+    if entry is not None:
+        return retarget(entry, url)
+
+    entry = build_entry(url, "url", _url_signals(url))
+    URL_CACHE.set(key, entry)
+    return retarget(entry, url)
+
+
+def _url_signals(url: str) -> List[Signal]:
+    parsed = parse_url_loose(url)
 
-    signals: List[Dict[str, Any]] = []
+    signals: List[Signal] = []
 
     # URL-level heuristics
-    signals.extend(url_signals(url))
+    signals.extend(url_signals(parsed))
 
     # Host-level heuristics
-    if host and is_ip(host):
-        signals.extend(ip_signals(host))
-    elif host:
-        signals.extend(domain_signals(host))
-
-    risk_score, confidence, breakdown, scoring_math = score_signals_detailed(signals)
-
-    result: Dict[str, Any] = {
-        "target": url,
-        "type": "url",
-        "risk_score": risk_score,
-        "confidence": confidence,
-        "verdict": verdict_for_score(risk_score),
-        "signals": signals,
-        "breakdown": breakdown,
-    }
-
-    explain = {
-        "target": url,
-        "type": "url",
-        "signals": signals,
-        "breakdown": breakdown,
-        "scoring": scoring_math,
-    }
-
-    return result, explain
+    if parsed.host_is_ip:
+        signals.extend(ip_signals(parsed.host))
+    elif parsed.host:
+        signals.extend(domain_signals(parsed.host_ascii))
 
+    return signals
+
+
+async def _no_signals() -> List[Signal]:
+    return []
 
-async def analyze_url_explain_async(url: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    _, parsed = parse_url_loose(url)
-    host = (parsed.hostname or "").strip("[]")
+
+async def _url_signals_async(url: str) -> Tuple[List[Signal], bool]:
+    parsed = parse_url_loose(url)
 
     # Run URL and Host signals in parallel
-    url_task = url_signals_async(url)
-    
-    if host and is_ip(host):
-        host_task = ip_signals_async(host)
-    elif host:
-        host_task = domain_signals_async(host)
+    url_task = url_signals_async(parsed)
+
+    if parsed.host_is_ip:
+        host_task = ip_signals_async(parsed.host)
+    elif parsed.host:
+        host_task = domain_signals_async(parsed.host_ascii)
     else:
-        host_task = asyncio.Future()
-        host_task.set_result([])
-
-    url_list, host_list = await asyncio.gather(url_task, host_task)
-    
-    signals = []
-    signals.extend(url_list)
-    signals.extend(host_list)
-
-    risk_score, confidence, breakdown, scoring_math = score_signals_detailed(signals)
-
-    result: Dict[str, Any] = {
-        "target": url,
-        "type": "url",
-        "risk_score": risk_score,
-        "confidence": confidence,
-        "verdict": verdict_for_score(risk_score),
-        "signals": signals,
-        "breakdown": breakdown,
-    }
-
-    explain = {
-        "target": url,
-        "type": "url",
-        "signals": signals,
-        "breakdown": breakdown,
-        "scoring": scoring_math,
-    }
-
-    return result, explain
+        host_task = _no_signals()
+
+    # A failing bundle must not take down the other one; keep whatever signals we got.
+    url_list, host_list = await asyncio.gather(url_task, host_task, return_exceptions=True)
+
+    signals: List[Signal] = []
+    complete = True
+    for bundle, res in (("url", url_list), ("host", host_list)):
+        if isinstance(res, BaseException):
+            logger.warning(f"{bundle} signals failed for {target_fingerprint(url)}: {res!r}")
+            complete = False
+            continue
+        signals.extend(res)
+
+    return signals, complete
+
+
+async def analyze_url_explain_async(url: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    key = normalize_url(url)
+    complete = True
+
+    async def compute() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        nonlocal complete
+        signals, complete = await _url_signals_async(url)
+        return build_entry(url, "url", signals)
+
+    # A partial result (one bundle failed) is still returned, but never cached.
+    entry = await URL_CACHE.get_or_compute_async(key, compute, cache_if=lambda _: complete)
+    return retarget(entry, url)
 
 
 def analyze_url(url: str) -> Dict[str, Any]:
-    return analyze_url_explain(url)[0]
+    key = normalize_url(url)
+
+    entry = URL_CACHE.get(key)
+    if entry is not None:
+        return retarget(entry, url)[0]
+
+    # Cache entries carry the full explain blob, so a miss here computes without it and isn't cached.
+    return build_entry(url, "url", _url_signals(url), want_explain=False)[0]
@@ -1,30 +1,50 @@
 ﻿from __future__ import annotations
 
+import asyncio
 import logging
 import time
-from typing import Any, Dict, Literal, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 
+from backend.analyzers.cache import cache_status, retarget
 from backend.analyzers.domain import analyze_domain_explain, analyze_domain_explain_async
 from backend.analyzers.ip import analyze_ip_explain, analyze_ip_explain_async
 from backend.analyzers.url import analyze_url_explain, analyze_url_explain_async
-from backend.persistence.sqlite_store import save_analysis
+from backend.persistence.sqlite_store import enqueue_analyses, enqueue_analysis
 from backend.utils.logging_utils import log_analysis_event
-from backend.utils.validators import detect_target_type
+from backend.utils.validators import ResolvedTarget, resolve_target
 from backend.utils.reputation import reputation_service
 
 
 logger = logging.getLogger("security_analyzer")
 router = APIRouter(tags=["analyze"])
 
+Entry = Tuple[Dict[str, Any], Dict[str, Any]]
+
+_ANALYZERS_ASYNC: Dict[str, Callable[[str], Awaitable[Entry]]] = {
+    "url": analyze_url_explain_async,
+    "ip": analyze_ip_explain_async,
+    "domain": analyze_domain_explain_async,
+}
+
+MAX_BATCH_TARGETS = 256
+
+# (type, normalized target) -> future of the analysis currently running for it.
+_INFLIGHT: Dict[Tuple[str, str], "asyncio.Future[Entry]"] = {}
+
 
 @router.get("/reputation/status")
-def reputation_status():
+def reputation_status() -> Dict[str, Any]:
     return reputation_service.get_status()
 
 
+@router.get("/cache/status")
+def analyzer_cache_status() -> Dict[str, Any]:
+    return cache_status()
+
+
 class AnalyzeRequest(BaseModel):
     # Preferred input
     target: Optional[str] = Field(None, description="Domain, URL, or IP address")
@@ -36,47 +56,82 @@ class AnalyzeRequest(BaseModel):
     verbose: bool = Field(False, description="Reserved for future debug output")
 
 
-def _resolve_target(req: AnalyzeRequest) -> str:
-    t = (req.target or req.input or "").strip()
-    if not t:
-        raise ValueError("Missing target")
-    return t
+class BatchAnalyzeRequest(BaseModel):
+    targets: List[str] = Field(..., description=f"Domains, URLs, or IP addresses (max {MAX_BATCH_TARGETS})")
+    parallel: int = Field(8, ge=1, le=32, description="Maximum number of analyses run concurrently")
 
 
-@router.post("/analyze", status_code=201)
-async def analyze(req: AnalyzeRequest) -> Dict[str, Any]:
-    start = time.perf_counter()
+def resolved_target_dep(req: AnalyzeRequest) -> ResolvedTarget:
+    """FastAPI dependency: resolve the request's target (type, analyzer input, cache key) once."""
 
     try:
-        target = _resolve_target(req)
+        return resolve_target(req.target or req.input or "", req.type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        # Compute analysis (public result) and explain blob (for persistence).
-        if req.type == "url":
-            result, explain = await analyze_url_explain_async(target)
-        elif req.type == "ip":
-            result, explain = await analyze_ip_explain_async(target)
-        elif req.type == "domain":
-            result, explain = await analyze_domain_explain_async(target)
+
+async def _analyze_shared(rt: ResolvedTarget) -> Entry:
+    """Run the analyzer for `rt`, sharing one computation between concurrent identical targets.
+
+    Callers that arrive while the same (type, normalized target) is in flight await the leader's
+    result instead of re-running the heuristics.
+    """
+
+    key = (rt.type, rt.key)
+    analyzer = _ANALYZERS_ASYNC[rt.type]
+
+    existing = _INFLIGHT.get(key)
+    if existing is not None:
+        try:
+            # Shield so a disconnecting follower can't cancel the leader's future.
+            return retarget(await asyncio.shield(existing), rt.value)
+        except asyncio.CancelledError:
+            if not existing.cancelled():
+                raise
+            # The leader was cancelled; compute on our own below.
+    else:
+        fut: "asyncio.Future[Entry]" = asyncio.get_running_loop().create_future()
+        _INFLIGHT[key] = fut
+        try:
+            entry = await analyzer(rt.value)
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            # Mark retrieved so a follower-less failure doesn't log "exception never retrieved".
+            fut.exception()
+            raise
         else:
-            detected, normalized = detect_target_type(target)
-            if detected == "url":
-                result, explain = await analyze_url_explain_async(target)
-            elif detected == "ip":
-                result, explain = await analyze_ip_explain_async(normalized)
-            else:
-                result, explain = await analyze_domain_explain_async(normalized)
+            fut.set_result(entry)
+            return entry
+        finally:
+            _INFLIGHT.pop(key, None)
+
+    return await analyzer(rt.value)
+
+
+@router.post("/analyze", status_code=201)
+async def analyze(rt: ResolvedTarget = Depends(resolved_target_dep)) -> Dict[str, Any]:
+    start = time.monotonic_ns()
+    target = rt.raw
+
+    try:
+        # Compute analysis (public result) and explain blob (for persistence).
+        result, explain = await _analyze_shared(rt)
 
         analysis_id = None
         persistence_ok = False
         try:
-            analysis_id = save_analysis(result=result, explain=explain)
+            # Queued for the background writer; an id is only known here if it was written inline.
+            analysis_id = enqueue_analysis(result=result, explain=explain)
             persistence_ok = True
         except Exception as e:
             # Best-effort persistence: log the error but don't fail the primary request.
             logger.error(f"Persistence failed for {target}: {e}")
             persistence_ok = False
 
-        latency_ms = int((time.perf_counter() - start) * 1000)
+        latency_ms = (time.monotonic_ns() - start) // 1_000_000
         log_analysis_event(
             logger,
             analysis_id=analysis_id,
@@ -95,3 +150,66 @@ async def analyze(req: AnalyzeRequest) -> Dict[str, Any]:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {e}")
+
+
+@router.post("/analyze/batch", status_code=201)
+async def analyze_batch(req: BatchAnalyzeRequest) -> List[Dict[str, Any]]:
+    """Analyze many targets in one request.
+
+    Results come back in input order; a target that fails gets `{"target", "error"}` in its slot
+    instead of failing the whole batch. All successful analyses are persisted together.
+    """
+
+    start = time.monotonic_ns()
+
+    targets = [t.strip() for t in req.targets]
+    if not targets:
+        raise HTTPException(status_code=400, detail="Missing targets")
+    if len(targets) > MAX_BATCH_TARGETS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_TARGETS} targets per batch")
+
+    sem = asyncio.Semaphore(req.parallel)
+
+    async def _one(target: str) -> Any:
+        async with sem:
+            try:
+                return await _analyze_shared(resolve_target(target))
+            except Exception as e:
+                return e
+
+    outcomes = await asyncio.gather(*(_one(t) for t in targets))
+    entries = [o for o in outcomes if not isinstance(o, Exception)]
+
+    persistence_ok = True
+    try:
+        enqueue_analyses(entries)
+    except Exception as e:
+        logger.error(f"Persistence failed for batch of {len(entries)}: {e}")
+        persistence_ok = False
+
+    latency_ms = (time.monotonic_ns() - start) // 1_000_000
+
+    response: List[Dict[str, Any]] = []
+    for target, outcome in zip(targets, outcomes):
+        if isinstance(outcome, ValueError):
+            response.append({"target": target, "error": str(outcome)})
+            continue
+        if isinstance(outcome, Exception):
+            response.append({"target": target, "error": f"Analysis failed: {outcome}"})
+            continue
+
+        result = outcome[0]
+        log_analysis_event(
+            logger,
+            analysis_id=None,
+            target=str(result.get("target", target)),
+            target_type=str(result.get("type", "")),
+            verdict=str(result.get("verdict", "")),
+            risk_score=int(result.get("risk_score", 0)),
+            confidence=float(result.get("confidence", 0.0)),
+            latency_ms=latency_ms,
+            persistence_ok=persistence_ok,
+        )
+        response.append(result)
+
+    return response
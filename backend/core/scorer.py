@@ -1,11 +1,31 @@
 ﻿from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Mapping, Tuple, Union
 
-from backend.core.weights import load_weights
+from backend.core.signal import Signal
+from backend.core.weights import get_weights_snapshot
+
+
+SignalLike = Union[Signal, Mapping[str, Any]]
 
 
 BUCKETS = ("reputation", "structure", "network")
+BUCKET_INDEX = {b: i for i, b in enumerate(BUCKETS)}
+
+# Evidence values that don't count as evidence.
+_EMPTY_EVIDENCE = (None, "", [], {})
+
+# Confidence model coefficients (see score_signals_detailed).
+_CONF_BASE = 0.15
+_CONF_AVG = 0.45
+_CONF_COV = 0.2
+_CONF_EV = 0.2
+_CONF_CONTRA = 0.35
+_CONF_LOW_INFO = 0.65  # penalty when fewer than two signals carry any impact
+_CONF_MIN = 0.05
+_CONF_MAX = 0.98
+# Coverage saturates at 8 signals; 1/8 is exact in binary, so the multiply matches the old divide.
+_INV_COVERAGE_N = 1.0 / 8.0
 
 
 def _clamp_int(value: float, lo: int = 0, hi: int = 100) -> int:
@@ -16,34 +36,95 @@ def _clamp_float(value: float, lo: float = 0.0, hi: float = 1.0) -> float:
     return max(lo, min(hi, float(value)))
 
 
-def _infer_bucket(signal: Dict[str, Any]) -> str:
-    bucket = signal.get("bucket")
-    if bucket in BUCKETS:
-        return str(bucket)
+# Backwards-compatible inference if a signal doesn't set bucket explicitly.
+_CATEGORY_BUCKET_INDEX = {
+    "ip": BUCKET_INDEX["network"],
+    "domain": BUCKET_INDEX["reputation"],
+    "url": BUCKET_INDEX["structure"],
+}
+_DEFAULT_BUCKET_INDEX = BUCKET_INDEX["structure"]
 
-    # Backwards-compatible inference if a signal doesn't set bucket explicitly.
-    category = str(signal.get("category") or "")
-    if category == "ip":
-        return "network"
-    if category == "domain":
-        return "reputation"
-    if category == "url":
-        return "structure"
 
-    return "structure"
+def _infer_bucket(signal: Signal) -> int:
+    """Return the signal's bucket as an index into BUCKETS."""
 
+    idx = BUCKET_INDEX.get(signal.bucket)
+    if idx is not None:
+        return idx
+    return _CATEGORY_BUCKET_INDEX.get(signal.category, _DEFAULT_BUCKET_INDEX)
 
-def _has_evidence(signal: Dict[str, Any]) -> bool:
-    ev = signal.get("evidence")
+
+def _has_evidence(signal: Signal) -> bool:
+    ev = signal.evidence
     if isinstance(ev, dict):
-        # Ignore evidence that is only an error.
-        meaningful = {k: v for k, v in ev.items() if k != "error" and v not in (None, "", [], {})}
-        return bool(meaningful)
+        # Ignore evidence that is only an error; stop at the first meaningful value.
+        return any(k != "error" and v not in _EMPTY_EVIDENCE for k, v in ev.items())
     return bool(ev)
 
 
+def _score_kernel(
+    impacts: List[float],
+    confidences: List[float],
+    weights: List[float],
+    bucket_idx: List[int],
+) -> Tuple[List[float], float, float, float, List[float], float, float, int]:
+    """Single pass over the signal columns computing every per-signal aggregate.
+
+    Returns:
+      contributions, weighted_sum, risk_mass, trust_mass, bucket_totals,
+      contradiction, avg_signal_confidence, informative_hits
+    """
+
+    n = len(impacts)
+    contributions = [0.0] * n
+    bucket_totals = [0.0] * len(BUCKETS)
+
+    weighted_sum = 0.0
+    risk_mass = 0.0
+    trust_mass = 0.0
+    conf_sum = 0.0
+    informative_hits = 0
+
+    for k in range(n):
+        impact = impacts[k]
+        conf = confidences[k]
+        contribution = impact * conf * weights[k]
+
+        contributions[k] = contribution
+        weighted_sum += contribution
+        conf_sum += conf
+
+        if contribution > 0:
+            risk_mass += contribution
+            bucket_totals[bucket_idx[k]] += contribution
+        else:
+            trust_mass -= contribution
+
+        if abs(impact) > 0:
+            informative_hits += 1
+
+    if risk_mass > 0 and trust_mass > 0:
+        contradiction = min(risk_mass, trust_mass) / max(risk_mass, trust_mass)
+    else:
+        contradiction = 0.0
+
+    avg_signal_conf = conf_sum / max(1, n)
+
+    return (
+        contributions,
+        weighted_sum,
+        risk_mass,
+        trust_mass,
+        bucket_totals,
+        contradiction,
+        avg_signal_conf,
+        informative_hits,
+    )
+
+
 def score_signals_detailed(
-    signals: Iterable[Dict[str, Any]],
+    signals: Iterable[SignalLike],
+    want_explain: bool = True,
 ) -> Tuple[int, float, Dict[str, int], Dict[str, Any]]:
     """Score signals into risk_score/confidence, plus breakdown and math.
 
@@ -54,75 +135,67 @@ def score_signals_detailed(
       confidence: float 0..1
       breakdown: {reputation, structure, network} -> int 0..100 (risk-only contribution)
       math: dict containing scoring details and per-signal contributions
+            (empty when want_explain is False; callers that only need the score skip building it)
     """
 
-    signals_list = list(signals)
+    # Grab one snapshot reference so a concurrent reload can't mix weight versions mid-score.
+    snap = get_weights_snapshot()
+
+    # Plain dicts are still accepted (tests, legacy callers); heuristics already emit Signal.
+    signals_list = [Signal.from_dict(s) for s in signals]
     if not signals_list:
         breakdown = {"reputation": 0, "structure": 0, "network": 0}
-        return 0, 0.2, breakdown, {"signals": [], "weights": load_weights()}
-
-    weights = load_weights()
-    default_weight = float(weights.get("default_weight", 1.0))
-    by_bucket = weights.get("by_bucket", {}) or {}
-    by_signal = weights.get("by_signal", {}) or {}
+        return 0, 0.2, breakdown, ({"signals": [], "weights": snap.raw} if want_explain else {})
 
-    weighted_sum = 0.0
-    risk_mass = 0.0
-    trust_mass = 0.0
+    default_weight = snap.default_weight
+    # Indexed like BUCKETS.
+    by_bucket = (snap.bucket_reputation, snap.bucket_structure, snap.bucket_network)
+    by_signal = snap.by_signal
 
-    breakdown_raw = {"reputation": 0.0, "structure": 0.0, "network": 0.0}
-    per_signal: List[Dict[str, Any]] = []
+    names: List[str] = []
+    impacts: List[float] = []
+    confidences: List[float] = []
+    final_weights: List[float] = []
+    bucket_idx: List[int] = []
 
     evidence_hits = 0
-    informative_hits = 0
-    conf_sum = 0.0
 
+    # Single extraction pass: pull the scoring fields out of each signal into parallel columns.
     for s in signals_list:
-        name = str(s.get("name") or "Unknown")
-        impact = float(s.get("impact", 0))
-        signal_conf = _clamp_float(s.get("confidence", 0.5), 0.0, 1.0)
+        name = str(s.name or "Unknown")
+        impact = float(s.impact)
+        signal_conf = _clamp_float(s.confidence, 0.0, 1.0)
 
         bucket = _infer_bucket(s)
-        bucket_weight = float(by_bucket.get(bucket, 1.0))
-        signal_weight = float(by_signal.get(name, 1.0))
-        inline_weight = float(s.get("weight", 1.0))
-
-        # Ensure weights are non-negative and sane.
-        if default_weight <= 0:
-            default_weight = 1.0
-        if bucket_weight <= 0:
-            bucket_weight = 1.0
-        if signal_weight <= 0:
-            signal_weight = 1.0
+        # Snapshot weights are already validated (positive floats).
+        bucket_weight = by_bucket[bucket]
+        signal_weight = by_signal.get(name, 1.0)
+        inline_weight = float(s.weight)
+
+        # Inline weights come from the signal itself, so still guard them.
         if inline_weight <= 0:
             inline_weight = 1.0
 
-        final_weight = default_weight * bucket_weight * signal_weight * inline_weight
-        contribution = impact * signal_conf * final_weight
-
-        weighted_sum += contribution
-        risk_mass += max(0.0, contribution)
-        trust_mass += max(0.0, -contribution)
-
-        breakdown_raw[bucket] = breakdown_raw.get(bucket, 0.0) + max(0.0, contribution)
+        names.append(name)
+        impacts.append(impact)
+        confidences.append(signal_conf)
+        final_weights.append(default_weight * bucket_weight * signal_weight * inline_weight)
+        bucket_idx.append(bucket)
 
         if _has_evidence(s):
             evidence_hits += 1
-        if abs(impact) > 0:
-            informative_hits += 1
 
-        conf_sum += signal_conf
-
-        per_signal.append(
-            {
-                "name": name,
-                "bucket": bucket,
-                "impact": impact,
-                "signal_confidence": signal_conf,
-                "weight": round(final_weight, 4),
-                "contribution": round(contribution, 4),
-            }
-        )
+    (
+        contributions,
+        weighted_sum,
+        risk_mass,
+        trust_mass,
+        bucket_totals,
+        contradiction,
+        avg_signal_conf,
+        informative_hits,
+    ) = _score_kernel(impacts, confidences, final_weights, bucket_idx)
+    breakdown_raw = dict(zip(BUCKETS, bucket_totals))
 
     # Risk is the signed sum of contributions, clamped into a user-friendly range.
     risk_score = _clamp_int(weighted_sum, 0, 100)
@@ -132,29 +205,39 @@ def score_signals_detailed(
     # - increases when evidence is available
     # - decreases when risk vs trust contributions strongly contradict each other
     n = len(signals_list)
-    coverage_factor = min(1.0, n / 8.0)
+    coverage_factor = min(1.0, n * _INV_COVERAGE_N)
     evidence_ratio = evidence_hits / max(1, n)
 
-    avg_signal_conf = conf_sum / max(1, n)
-
-    if risk_mass > 0 and trust_mass > 0:
-        contradiction = min(risk_mass, trust_mass) / max(risk_mass, trust_mass)
-    else:
-        contradiction = 0.0
-
-    base = 0.15 + (0.45 * avg_signal_conf) + (0.2 * coverage_factor) + (0.2 * evidence_ratio)
+    base = _CONF_BASE + (_CONF_AVG * avg_signal_conf) + (_CONF_COV * coverage_factor) + (_CONF_EV * evidence_ratio)
 
     # If almost everything is zero-impact, we are less certain.
     if informative_hits < 2:
-        base *= 0.65
+        base *= _CONF_LOW_INFO
 
-    confidence = base - (0.35 * contradiction)
-    confidence = _clamp_float(confidence, 0.05, 0.98)
+    confidence = base - (_CONF_CONTRA * contradiction)
+    confidence = _clamp_float(confidence, _CONF_MIN, _CONF_MAX)
 
     breakdown = {k: _clamp_int(v, 0, 100) for k, v in breakdown_raw.items()}
 
+    if not want_explain:
+        return risk_score, round(confidence, 2), breakdown, {}
+
+    per_signal: List[Dict[str, Any]] = [
+        {
+            "name": name,
+            "bucket": BUCKETS[bucket],
+            "impact": impact,
+            "signal_confidence": signal_conf,
+            "weight": round(final_weight, 4),
+            "contribution": round(contribution, 4),
+        }
+        for name, bucket, impact, signal_conf, final_weight, contribution in zip(
+            names, bucket_idx, impacts, confidences, final_weights, contributions
+        )
+    ]
+
     math = {
-        "weights": weights,
+        "weights": snap.raw,
         "weighted_sum": round(weighted_sum, 4),
         "risk_mass": round(risk_mass, 4),
         "trust_mass": round(trust_mass, 4),
@@ -169,8 +252,8 @@ def score_signals_detailed(
     return risk_score, round(confidence, 2), breakdown, math
 
 
-def score_signals(signals: Iterable[Dict[str, Any]]) -> Tuple[int, float]:
+def score_signals(signals: Iterable[SignalLike]) -> Tuple[int, float]:
     """Compatibility wrapper used by simple callers."""
 
-    risk_score, confidence, _, _ = score_signals_detailed(signals)
+    risk_score, confidence, _, _ = score_signals_detailed(signals, want_explain=False)
     return risk_score, confidence
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Mapping
+
+
+@dataclass(frozen=True, slots=True)
+class Signal:
+    """One heuristic finding.
+
+    Heuristics emit these and the scorer reads their attributes directly; they are turned into
+    plain dicts once, at the analyzer boundary (see `to_dict`), so the API/explain JSON shape is
+    unchanged. Read-only `s["name"]` / `s.get("name")` access is kept for older callers.
+    """
+
+    name: str
+    category: str
+    bucket: str
+    impact: float
+    confidence: float
+    description: str
+    evidence: Any = None
+    weight: float = 1.0
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELDS
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in _FIELDS else default
+
+    @classmethod
+    def from_dict(cls, d: Mapping[str, Any]) -> "Signal":
+        if isinstance(d, Signal):
+            return d
+        return cls(
+            name=_intern(d.get("name")),
+            category=_intern(d.get("category")),
+            bucket=_intern(d.get("bucket")),
+            impact=d.get("impact", 0),
+            confidence=d.get("confidence", 0.5),
+            description=d.get("description", ""),
+            evidence=d.get("evidence"),
+            weight=d.get("weight", 1.0),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        d: Dict[str, Any] = {
+            "name": self.name,
+            "category": self.category,
+            "bucket": self.bucket,
+            "impact": self.impact,
+            "confidence": self.confidence,
+            "description": self.description,
+            "evidence": self.evidence,
+        }
+        # Inline weights are rare; keep them out of the payload unless set.
+        if self.weight != 1.0:
+            d["weight"] = self.weight
+        return d
+
+
+def _intern(value: Any) -> Any:
+    # Names/categories/buckets come from a small fixed vocabulary; dicts decoded from JSON or built
+    # by callers carry fresh copies, so collapse them onto one shared string each.
+    return sys.intern(value) if type(value) is str else value
+
+
+_FIELDS = frozenset(f.name for f in fields(Signal))
@@ -6,10 +6,13 @@ SUSPICIOUS = "SUSPICIOUS"
 MALICIOUS = "MALICIOUS"
 
 
+# One entry per possible score; thresholds: >=70 MALICIOUS, >=30 SUSPICIOUS, else SAFE.
+_VERDICTS = tuple(MALICIOUS if s >= 70 else SUSPICIOUS if s >= 30 else SAFE for s in range(101))
+
+
 def verdict_for_score(risk_score: int) -> str:
-    """Map an integer risk score (0-100) to a simple, explainable verdict."""
-    if risk_score >= 70:
-        return MALICIOUS
-    if risk_score >= 30:
-        return SUSPICIOUS
-    return SAFE
+    """Map an integer risk score (0-100) to a simple, explainable verdict.
+
+    Out-of-range scores are clamped rather than raising.
+    """
+    return _VERDICTS[max(0, min(100, int(risk_score)))]
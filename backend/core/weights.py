@@ -2,9 +2,10 @@
 
 import json
 import os
+import threading
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, NamedTuple
 
 
 def _default_weights_path() -> Path:
@@ -62,3 +63,61 @@ def load_weights() -> Dict[str, Any]:
 
     except Exception:
         return defaults
+
+
+class WeightsSnapshot(NamedTuple):
+    """Immutable, pre-validated view of the weights used on the scoring hot path."""
+
+    default_weight: float
+    bucket_reputation: float
+    bucket_structure: float
+    bucket_network: float
+    by_signal: Dict[str, float]
+    raw: Dict[str, Any]
+
+
+def _positive(value: Any) -> float:
+    # Non-positive or malformed weights fall back to neutral (1.0).
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        return 1.0
+    return v if v > 0 else 1.0
+
+
+def _build_snapshot(weights: Dict[str, Any]) -> WeightsSnapshot:
+    by_bucket = weights.get("by_bucket", {}) or {}
+    by_signal = weights.get("by_signal", {}) or {}
+
+    return WeightsSnapshot(
+        default_weight=_positive(weights.get("default_weight", 1.0)),
+        bucket_reputation=_positive(by_bucket.get("reputation", 1.0)),
+        bucket_structure=_positive(by_bucket.get("structure", 1.0)),
+        bucket_network=_positive(by_bucket.get("network", 1.0)),
+        by_signal={str(k): _positive(v) for k, v in by_signal.items()},
+        raw=weights,
+    )
+
+
+_SNAPSHOT_LOCK = threading.Lock()
+_WEIGHTS_SNAPSHOT: WeightsSnapshot = _build_snapshot(load_weights())
+
+
+def get_weights_snapshot() -> WeightsSnapshot:
+    """Return the current weights snapshot (built at import; replaced by `reload_weights`)."""
+
+    return _WEIGHTS_SNAPSHOT
+
+
+def reload_weights() -> WeightsSnapshot:
+    """Re-read the weights file and atomically swap in a new snapshot.
+
+    Readers never lock: they grab the current snapshot reference once per scoring call.
+    """
+
+    global _WEIGHTS_SNAPSHOT
+
+    with _SNAPSHOT_LOCK:
+        load_weights.cache_clear()
+        _WEIGHTS_SNAPSHOT = _build_snapshot(load_weights())
+        return _WEIGHTS_SNAPSHOT
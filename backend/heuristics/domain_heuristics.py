@@ -2,14 +2,20 @@
 
 import asyncio
 import math
-from typing import Any, Dict, List, Optional
-
+import re
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.core.signal import Signal
 from backend.utils.dns_utils import dns_overview, dns_overview_async
 from backend.utils.whois_utils import domain_age_days, domain_age_days_async
 from backend.utils.reputation import reputation_service
 
 
-SUSPICIOUS_TLDS = {
+SUSPICIOUS_TLDS = frozenset({
     "top",
     "xyz",
     "tk",
@@ -23,26 +29,28 @@ SUSPICIOUS_TLDS = {
     "download",
     "review",
     "accountant",
-}
+})
 
 # Small, explainable lists (academic/demo purpose). Extend as needed.
-REPUTABLE_REGISTRARS = {
+REPUTABLE_REGISTRARS = frozenset({
     "cloudflare, inc.",
     "namecheap, inc.",
     "godaddy.com, llc",
     "gandi sas",
     "tucows domains inc.",
     "markmonitor inc.",
-}
+})
 
-SUSPICIOUS_REGISTRAR_KEYWORDS = {
+SUSPICIOUS_REGISTRAR_KEYWORDS = frozenset({
     "privacy",
     "protect",
     "whoisguard",
-}
+})
+
+_SUSPICIOUS_REGISTRAR_RE = re.compile("|".join(re.escape(k) for k in sorted(SUSPICIOUS_REGISTRAR_KEYWORDS)))
 
 # A small brand list for typosquatting heuristics; keep it limited and transparent.
-BRANDS = {
+BRANDS = frozenset({
     "google",
     "microsoft",
     "apple",
@@ -65,15 +73,16 @@ BRANDS = {
     "telegram",
     "chatgpt",
     "openai",
-    "google",
     "youtube",
     "linkedin",
     "twitter",
     "x",
-}
+})
+
+_BRAND_LIST = tuple(sorted(BRANDS))
 
 # Domains that are virtually guaranteed to be safe (Top-tier global services).
-TOP_TIER_DOMAINS = {
+TOP_TIER_DOMAINS = frozenset({
     "chatgpt.com",
     "openai.com",
     "google.com",
@@ -87,9 +96,9 @@ TOP_TIER_DOMAINS = {
     "twitter.com",
     "x.com",
     "youtube.com",
-}
+})
 
-PARKING_NS_KEYWORDS = {
+PARKING_NS_KEYWORDS = frozenset({
     "sedoparking",
     "parkingcrew",
     "bodis",
@@ -97,129 +106,118 @@ PARKING_NS_KEYWORDS = {
     "uniregistrymarket",
     "namebrightdns",
     "domainparking",
-}
+})
+
+# All parking keywords in one pattern: a single scan over the joined NS list finds the first hit.
+_PARKING_NS_RE = re.compile("|".join(re.escape(k) for k in sorted(PARKING_NS_KEYWORDS)))
 
 
 def _entropy(s: str) -> float:
     if not s:
         return 0.0
-    freq: Dict[str, int] = {}
-    for ch in s:
-        freq[ch] = freq.get(ch, 0) + 1
+    # Counter tallies characters in C; iteration order matches the old manual dict, so results are identical.
     n = len(s)
     ent = 0.0
-    for c in freq.values():
+    for c in Counter(s).values():
         p = c / n
         ent -= p * math.log2(p)
     return ent
 
 
-def _edit_distance(a: str, b: str) -> int:
-    """Levenshtein edit distance.
+def _first_diff(a: str, b: str) -> int:
+    """Index of the first position where `a` and `b` differ (the shorter length if one is a prefix)."""
+    for k, (ca, cb) in enumerate(zip(a, b)):
+        if ca != cb:
+            return k
+    return min(len(a), len(b))
 
-    This is only used against a small local brand list, so performance is fine.
-    """
 
-    if a == b:
-        return 0
-    if not a:
-        return len(b)
-    if not b:
-        return len(a)
-
-    prev = list(range(len(b) + 1))
-    for i, ca in enumerate(a, start=1):
-        cur = [i]
-        for j, cb in enumerate(b, start=1):
-            ins = cur[j - 1] + 1
-            delete = prev[j] + 1
-            sub = prev[j - 1] + (0 if ca == cb else 1)
-            cur.append(min(ins, delete, sub))
-        prev = cur
-    return prev[-1]
+def _is_single_edit(a: str, b: str) -> bool:
+    """True when `a` and `b` are exactly one insertion/deletion/substitution apart."""
 
+    k = _first_diff(a, b)
+    la, lb = len(a), len(b)
+    if la == lb:
+        return k < la and a[k + 1:] == b[k + 1:]
+    if la == lb + 1:
+        return a[k + 1:] == b[k:]
+    if lb == la + 1:
+        return a[k:] == b[k + 1:]
+    return False
 
+
+@lru_cache(maxsize=4096)
 def _tld(domain: str) -> str:
     parts = [p for p in domain.split(".") if p]
     return parts[-1].lower() if len(parts) >= 2 else ""
 
 
+@lru_cache(maxsize=4096)
 def _sld(domain: str) -> str:
     parts = [p for p in domain.split(".") if p]
     return parts[-2].lower() if len(parts) >= 2 else domain.lower()
 
 
-def suspicious_tld_signal(domain: str) -> Optional[Dict[str, Any]]:
+def suspicious_tld_signal(domain: str) -> Optional[Signal]:
     tld = _tld(domain)
     if tld in SUSPICIOUS_TLDS:
-        return {
-            "name": "Suspicious TLD",
-            "category": "domain",
-            "bucket": "structure",
-            "impact": 18,
-            "confidence": 0.8,
-            "description": f"The .{tld} TLD is statistically over-represented in abuse reports.",
-            "evidence": {"tld": tld},
-        }
+        return Signal(
+            name="Suspicious TLD",
+            category="domain",
+            bucket="structure",
+            impact=18,
+            confidence=0.8,
+            description=f"The .{tld} TLD is statistically over-represented in abuse reports.",
+            evidence={"tld": tld},
+        )
     return None
 
 
-def domain_age_signal(domain: str, days_meta: Optional[Tuple[Optional[int], Dict[str, Any]]] = None) -> Dict[str, Any]:
+# Upper bounds (exclusive, in days) of each age band; _AGE_ROWS has one extra row for "older".
+_AGE_THRESHOLDS = (30, 90, 180, 365)
+# (age_bucket, impact, confidence, description template)
+_AGE_ROWS = (
+    ("lt_30d", 30, 0.75, "Domain appears very new ({days} days old)."),
+    ("lt_90d", 15, 0.65, "Domain is relatively new ({days} days old)."),
+    ("lt_1y", 15, 0.65, "Domain is relatively new ({days} days old)."),
+    ("lt_1y", 5, 0.55, "Domain is under 1 year old ({days} days old)."),
+    ("gte_1y", -6, 0.6, "Domain age is over 1 year ({days} days old), which is a mild trust signal."),
+)
+
+
+def domain_age_signal(domain: str, days_meta: Optional[Tuple[Optional[int], Dict[str, Any]]] = None) -> Signal:
     if days_meta is None:
         days, meta = domain_age_days(domain)
     else:
         days, meta = days_meta
 
     if days is None:
-        return {
-            "name": "Domain Age",
-            "category": "domain",
-            "bucket": "reputation",
-            "impact": 0,
-            "confidence": 0.2,
-            "description": "WHOIS domain age could not be determined.",
-            "evidence": {k: str(v) for k, v in (meta or {}).items() if k != "creation_date"},
-        }
-
-    # Age bucketing (explicit, explainable)
-    if days < 30:
-        age_bucket = "lt_30d"
-    elif days < 90:
-        age_bucket = "lt_90d"
-    elif days < 365:
-        age_bucket = "lt_1y"
-    else:
-        age_bucket = "gte_1y"
-
-    if days < 30:
-        impact = 30
-        conf = 0.75
-        desc = f"Domain appears very new ({days} days old)."
-    elif days < 180:
-        impact = 15
-        conf = 0.65
-        desc = f"Domain is relatively new ({days} days old)."
-    elif days < 365:
-        impact = 5
-        conf = 0.55
-        desc = f"Domain is under 1 year old ({days} days old)."
-    else:
-        impact = -6
-        conf = 0.6
-        desc = f"Domain age is over 1 year ({days} days old), which is a mild trust signal."
-
-    return {
-        "name": "Domain Age",
-        "category": "domain",
-        "bucket": "reputation",
-        "impact": impact,
-        "confidence": conf,
-        "description": desc,
-        "evidence": {"age_days": days, "age_bucket": age_bucket},
-    }
-
-
-def registrar_reputation_signal(domain: str, days_meta: Optional[Tuple[Optional[int], Dict[str, Any]]] = None) -> Dict[str, Any]:
+        return Signal(
+            name="Domain Age",
+            category="domain",
+            bucket="reputation",
+            impact=0,
+            confidence=0.2,
+            description="WHOIS domain age could not be determined.",
+            evidence={k: str(v) for k, v in (meta or {}).items() if k != "creation_date"},
+        )
+
+    # Age bucketing (explicit, explainable): one table row per threshold band.
+    age_bucket, impact, conf, desc_tmpl = _AGE_ROWS[bisect_right(_AGE_THRESHOLDS, days)]
+    desc = desc_tmpl.format(days=days)
+
+    return Signal(
+        name="Domain Age",
+        category="domain",
+        bucket="reputation",
+        impact=impact,
+        confidence=conf,
+        description=desc,
+        evidence={"age_days": days, "age_bucket": age_bucket},
+    )
+
+
+def registrar_reputation_signal(domain: str, days_meta: Optional[Tuple[Optional[int], Dict[str, Any]]] = None) -> Signal:
     if days_meta is None:
         _, meta = domain_age_days(domain)
     else:
@@ -229,50 +227,66 @@ def registrar_reputation_signal(domain: str, days_meta: Optional[Tuple[Optional[
     registrar_norm = str(registrar).strip().lower()
 
     if not registrar_norm:
-        return {
-            "name": "Registrar Reputation",
-            "category": "domain",
-            "bucket": "reputation",
-            "impact": 5,
-            "confidence": 0.4,
-            "description": "Registrar could not be identified (weak risk signal).",
-            "evidence": {},
-        }
+        return Signal(
+            name="Registrar Reputation",
+            category="domain",
+            bucket="reputation",
+            impact=5,
+            confidence=0.4,
+            description="Registrar could not be identified (weak risk signal).",
+            evidence={},
+        )
 
     if registrar_norm in REPUTABLE_REGISTRARS:
-        return {
-            "name": "Registrar Reputation",
-            "category": "domain",
-            "bucket": "reputation",
-            "impact": -4,
-            "confidence": 0.55,
-            "description": "Registrar is commonly used by reputable organizations (weak trust signal).",
-            "evidence": {"registrar": registrar},
-        }
-
-    if any(k in registrar_norm for k in SUSPICIOUS_REGISTRAR_KEYWORDS):
-        return {
-            "name": "Registrar Reputation",
-            "category": "domain",
-            "bucket": "reputation",
-            "impact": 10,
-            "confidence": 0.5,
-            "description": "Registrar string suggests heavy privacy/proxying (weak risk signal).",
-            "evidence": {"registrar": registrar},
-        }
-
-    return {
-        "name": "Registrar Reputation",
-        "category": "domain",
-        "bucket": "reputation",
-        "impact": 2,
-        "confidence": 0.35,
-        "description": "Registrar is not in the local reputation lists (very weak risk signal).",
-        "evidence": {"registrar": registrar},
-    }
-
-
-def registrar_randomness_signal(domain: str, days_meta: Optional[Tuple[Optional[int], Dict[str, Any]]] = None) -> Dict[str, Any]:
+        return Signal(
+            name="Registrar Reputation",
+            category="domain",
+            bucket="reputation",
+            impact=-4,
+            confidence=0.55,
+            description="Registrar is commonly used by reputable organizations (weak trust signal).",
+            evidence={"registrar": registrar},
+        )
+
+    if _SUSPICIOUS_REGISTRAR_RE.search(registrar_norm):
+        return Signal(
+            name="Registrar Reputation",
+            category="domain",
+            bucket="reputation",
+            impact=10,
+            confidence=0.5,
+            description="Registrar string suggests heavy privacy/proxying (weak risk signal).",
+            evidence={"registrar": registrar},
+        )
+
+    return Signal(
+        name="Registrar Reputation",
+        category="domain",
+        bucket="reputation",
+        impact=2,
+        confidence=0.35,
+        description="Registrar is not in the local reputation lists (very weak risk signal).",
+        evidence={"registrar": registrar},
+    )
+
+
+# Delete sets for counting by length difference: bytes.translate(None, ...) strips them in one C pass.
+_ASCII_DIGITS = b"0123456789"
+_ASCII_NON_ALNUM = bytes(c for c in range(128) if not chr(c).isalnum())
+
+
+def _count_digits_non_alnum(text: str) -> Tuple[int, int]:
+    """Return (digit count, non-alphanumeric count) for `text`."""
+
+    if text.isascii():
+        raw = text.encode("ascii")
+        n = len(raw)
+        return n - len(raw.translate(None, _ASCII_DIGITS)), n - len(raw.translate(None, _ASCII_NON_ALNUM))
+    # Unicode digits/letters are outside the delete sets; count those the slow way.
+    return sum(ch.isdigit() for ch in text), sum((not ch.isalnum()) for ch in text)
+
+
+def registrar_randomness_signal(domain: str, days_meta: Optional[Tuple[Optional[int], Dict[str, Any]]] = None) -> Signal:
     """Detect unusual registrar strings.
 
     This is a weak heuristic: registrar names are usually human-readable, so we treat this as low confidence.
@@ -288,19 +302,18 @@ def registrar_randomness_signal(domain: str, days_meta: Optional[Tuple[Optional[
     registrar_norm = registrar_s.lower()
 
     if not registrar_s:
-        return {
-            "name": "Registrar Randomness",
-            "category": "domain",
-            "bucket": "reputation",
-            "impact": 0,
-            "confidence": 0.2,
-            "description": "Registrar could not be identified; randomness check skipped.",
-            "evidence": {},
-        }
+        return Signal(
+            name="Registrar Randomness",
+            category="domain",
+            bucket="reputation",
+            impact=0,
+            confidence=0.2,
+            description="Registrar could not be identified; randomness check skipped.",
+            evidence={},
+        )
 
     # Simple, explainable indicators of "random" strings.
-    digits = sum(ch.isdigit() for ch in registrar_s)
-    non_alnum = sum((not ch.isalnum()) for ch in registrar_s)
+    digits, non_alnum = _count_digits_non_alnum(registrar_s)
     length = max(1, len(registrar_s))
     digit_ratio = digits / length
     non_alnum_ratio = non_alnum / length
@@ -309,92 +322,92 @@ def registrar_randomness_signal(domain: str, days_meta: Optional[Tuple[Optional[
     suspicious = (digit_ratio > 0.2) or (non_alnum_ratio > 0.25) or (ent >= 4.2)
 
     if suspicious:
-        return {
-            "name": "Registrar Randomness",
-            "category": "domain",
-            "bucket": "reputation",
-            "impact": 6,
-            "confidence": 0.35,
-            "description": "Registrar string looks unusually noisy/random (weak risk signal).",
-            "evidence": {
+        return Signal(
+            name="Registrar Randomness",
+            category="domain",
+            bucket="reputation",
+            impact=6,
+            confidence=0.35,
+            description="Registrar string looks unusually noisy/random (weak risk signal).",
+            evidence={
                 "registrar": registrar_s,
                 "digit_ratio": round(digit_ratio, 3),
                 "non_alnum_ratio": round(non_alnum_ratio, 3),
                 "entropy": round(ent, 2),
             },
-        }
+        )
 
-    return {
-        "name": "Registrar Randomness",
-        "category": "domain",
-        "bucket": "reputation",
-        "impact": 0,
-        "confidence": 0.35,
-        "description": "Registrar string looks typical.",
-        "evidence": {"entropy": round(ent, 2)},
-    }
+    return Signal(
+        name="Registrar Randomness",
+        category="domain",
+        bucket="reputation",
+        impact=0,
+        confidence=0.35,
+        description="Registrar string looks typical.",
+        evidence={"entropy": round(ent, 2)},
+    )
 
 
-def dns_validity_signals(domain: str, ov: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+def dns_validity_signals(domain: str, ov: Optional[Dict[str, Any]] = None) -> List[Signal]:
     if ov is None:
         ov = dns_overview(domain)
     
-    signals: List[Dict[str, Any]] = []
+    signals: List[Signal] = []
 
     if not ov.get("has_ns"):
         signals.append(
-            {
-                "name": "DNS Nameservers",
-                "category": "domain",
-                "bucket": "network",
-                "impact": 12,
-                "confidence": 0.7,
-                "description": "No NS records found (domain may be misconfigured or newly staged).",
-                "evidence": {"NS": ov.get("NS", [])},
-            }
+            Signal(
+                name="DNS Nameservers",
+                category="domain",
+                bucket="network",
+                impact=12,
+                confidence=0.7,
+                description="No NS records found (domain may be misconfigured or newly staged).",
+                evidence={"NS": ov.get("NS", [])},
+            )
         )
     else:
         signals.append(
-            {
-                "name": "DNS Nameservers",
-                "category": "domain",
-                "bucket": "network",
-                "impact": -3,
-                "confidence": 0.5,
-                "description": "NS records exist (weak trust signal).",
-                "evidence": {"NS": ov.get("NS", [])[:3]},
-            }
+            Signal(
+                name="DNS Nameservers",
+                category="domain",
+                bucket="network",
+                impact=-3,
+                confidence=0.5,
+                description="NS records exist (weak trust signal).",
+                evidence={"NS": ov.get("NS", [])[:3]},
+            )
         )
 
     if not ov.get("has_a_or_aaaa"):
         signals.append(
-            {
-                "name": "DNS A/AAAA",
-                "category": "domain",
-                "bucket": "network",
-                "impact": 14,
-                "confidence": 0.75,
-                "description": "No A/AAAA records found (domain does not resolve).",
-                "evidence": {"A": ov.get("A", []), "AAAA": ov.get("AAAA", [])},
-            }
+            Signal(
+                name="DNS A/AAAA",
+                category="domain",
+                bucket="network",
+                impact=14,
+                confidence=0.75,
+                description="No A/AAAA records found (domain does not resolve).",
+                evidence={"A": ov.get("A", []), "AAAA": ov.get("AAAA", [])},
+            )
         )
     else:
         signals.append(
-            {
-                "name": "DNS A/AAAA",
-                "category": "domain",
-                "bucket": "network",
-                "impact": -2,
-                "confidence": 0.5,
-                "description": "Domain resolves to at least one IP (weak trust signal).",
-                "evidence": {"A": ov.get("A", [])[:3], "AAAA": ov.get("AAAA", [])[:3]},
-            }
+            Signal(
+                name="DNS A/AAAA",
+                category="domain",
+                bucket="network",
+                impact=-2,
+                confidence=0.5,
+                description="Domain resolves to at least one IP (weak trust signal).",
+                evidence={"A": ov.get("A", [])[:3], "AAAA": ov.get("AAAA", [])[:3]},
+            )
         )
 
     return signals
 
 
-def parked_domain_signal(domain: str, ov: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def parked_domain_signal(domain: str, ov: Optional[Dict[str, Any]] = None) -> Signal:
     """Best-effort parked domain detection.
 
     This relies on NS keywords and the absence of typical email infrastructure (MX).
@@ -406,50 +419,45 @@ def parked_domain_signal(domain: str, ov: Optional[Dict[str, Any]] = None) -> Di
     
     ns = [str(x).lower() for x in (ov.get("NS") or [])]
 
-    ns_hit = None
-    for n in ns:
-        for k in PARKING_NS_KEYWORDS:
-            if k in n:
-                ns_hit = k
-                break
-        if ns_hit:
-            break
+    # NUL can't occur in a hostname, so no match spans two nameservers.
+    m = _PARKING_NS_RE.search("\x00".join(ns))
+    ns_hit = m.group(0) if m else None
 
     if ns_hit and (not ov.get("has_mx")):
-        return {
-            "name": "Parked Domain Suspected",
-            "category": "domain",
-            "bucket": "reputation",
-            "impact": 12,
-            "confidence": 0.55,
-            "description": "Nameserver suggests domain parking, and no MX records were found.",
-            "evidence": {"ns_keyword": ns_hit, "NS": ns[:3], "has_mx": bool(ov.get("has_mx"))},
-        }
-
-    return {
-        "name": "Parked Domain Suspected",
-        "category": "domain",
-        "bucket": "reputation",
-        "impact": 0,
-        "confidence": 0.35,
-        "description": "No strong parked-domain indicators found.",
-        "evidence": {"NS": ns[:3], "has_mx": bool(ov.get("has_mx"))},
-    }
-
-
-def idn_punycode_signal(domain: str) -> Optional[Dict[str, Any]]:
+        return Signal(
+            name="Parked Domain Suspected",
+            category="domain",
+            bucket="reputation",
+            impact=12,
+            confidence=0.55,
+            description="Nameserver suggests domain parking, and no MX records were found.",
+            evidence={"ns_keyword": ns_hit, "NS": ns[:3], "has_mx": bool(ov.get("has_mx"))},
+        )
+
+    return Signal(
+        name="Parked Domain Suspected",
+        category="domain",
+        bucket="reputation",
+        impact=0,
+        confidence=0.35,
+        description="No strong parked-domain indicators found.",
+        evidence={"NS": ns[:3], "has_mx": bool(ov.get("has_mx"))},
+    )
+
+
+def idn_punycode_signal(domain: str) -> Optional[Signal]:
     sld = _sld(domain)
     # Punycode domains are sometimes used for IDN/homoglyph attacks.
     if sld.startswith("xn--"):
-        return {
-            "name": "IDN/Punycode",
-            "category": "domain",
-            "bucket": "structure",
-            "impact": 15,
-            "confidence": 0.6,
-            "description": "Domain uses punycode (can be normal, but also used in lookalike attacks).",
-            "evidence": {"sld": sld},
-        }
+        return Signal(
+            name="IDN/Punycode",
+            category="domain",
+            bucket="structure",
+            impact=15,
+            confidence=0.6,
+            description="Domain uses punycode (can be normal, but also used in lookalike attacks).",
+            evidence={"sld": sld},
+        )
     return None
 
 
@@ -464,47 +472,49 @@ HOMOGLYPH_MAP = {
     's': 's', 'ś': 's', 'š': 's', 'ş': 's', 'ѕ': 's',
 }
 
+# Single-character mappings as a translate table (multi-character ones are handled by replace()).
+_HOMOGLYPH_TABLE = str.maketrans({k: v for k, v in HOMOGLYPH_MAP.items() if len(k) == 1})
+
+
+@lru_cache(maxsize=4096)
 def _homoglyph_skeleton(text: str) -> str:
     """Normalize text to a 'skeleton' form to detect visual lookalikes."""
     t = text.lower()
     # Handle complex multi-char homoglyphs first
     t = t.replace('vv', 'w').replace('rn', 'm')
-    
-    skeleton = []
-    for char in t:
-        # Check map, otherwise keep char
-        skeleton.append(HOMOGLYPH_MAP.get(char, char))
-    
-    return "".join(skeleton)
 
+    return t.translate(_HOMOGLYPH_TABLE)
 
-def homoglyph_attack_signal(domain: str) -> Optional[Dict[str, Any]]:
+
+# Brand skeletons are fixed, so invert them once: a lookalike check is then a single dict lookup.
+_SKELETON_TO_BRAND: Dict[str, str] = {_homoglyph_skeleton(brand): brand for brand in sorted(BRANDS)}
+
+
+def homoglyph_attack_signal(domain: str, is_reputable: Optional[bool] = None) -> Optional[Signal]:
     sld = _sld(domain)
     if not sld or len(sld) < 4:
         return None
 
     # Don't flag domains that are already in our reputable list
-    normalized_domain = domain.lower().strip(".")
-    if normalized_domain.startswith("www."):
-        normalized_domain = normalized_domain[4:]
-    if normalized_domain in TOP_TIER_DOMAINS or reputation_service.is_reputable(domain):
+    if is_reputable is None:
+        is_reputable = _is_reputable(domain)
+    if is_reputable:
         return None
 
     skeleton = _homoglyph_skeleton(sld)
     
     # Check if the skeleton matches a known high-value brand
-    for brand in BRANDS:
-        brand_skeleton = _homoglyph_skeleton(brand)
-        if skeleton == brand_skeleton and sld != brand:
-            return {
-                "name": "Homoglyph Lookalike Detected",
-                "category": "domain",
-                "bucket": "structure",
-                "impact": 35, # High risk impact
-                "confidence": 0.85,
-                "description": f"Domain '{sld}' is visually similar to the protected brand '{brand}' using homoglyph characters.",
-                "evidence": {"sld": sld, "lookalike_of": brand, "skeleton": skeleton},
-            }
+    brand = _SKELETON_TO_BRAND.get(skeleton)
+    if brand is not None and sld != brand:
+        return Signal(
+            name="Homoglyph Lookalike Detected",
+            category="domain",
+            bucket="structure",
+            impact=35, # High risk impact
+            confidence=0.85,
+            description=f"Domain '{sld}' is visually similar to the protected brand '{brand}' using homoglyph characters.",
+            evidence={"sld": sld, "lookalike_of": brand, "skeleton": skeleton},
+        )
 
     return None
 
@@ -524,108 +534,198 @@ def _is_keyboard_neighbor(char1: str, char2: str) -> bool:
 def _identify_typo_type(typo: str, brand: str) -> Optional[str]:
     """Categorize the type of typosquatting attack."""
     if typo == brand: return None
-    
+
+    # Each structural check finds the first differing index k and compares the remaining suffixes
+    # once, instead of rebuilding a candidate string for every position.
+    k = _first_diff(typo, brand)
+    lt, lb = len(typo), len(brand)
+
     # 1. Omission (gogle)
-    for i in range(len(brand)):
-        if brand[:i] + brand[i+1:] == typo:
-            return "omission"
-            
-    # 2. Repetition (gooogle)
-    for i in range(len(typo)):
-        if typo[:i] + typo[i+1:] == brand and typo[i] == typo[i-1 if i > 0 else 0]:
-            return "repetition"
-            
+    if lt == lb - 1 and typo[k:] == brand[k + 1:]:
+        return "omission"
+
+    # 2. Repetition (gooogle): the extra character repeats its predecessor (or leads the string)
+    if lt == lb + 1 and typo[k + 1:] == brand[k:] and (k == 0 or typo[k] == typo[k - 1]):
+        return "repetition"
+
     # 3. Transposition (goolge)
-    for i in range(len(brand) - 1):
-        swapped = list(brand)
-        swapped[i], swapped[i+1] = swapped[i+1], swapped[i]
-        if "".join(swapped) == typo:
-            return "transposition"
-            
-    # 4. Keyboard Neighbor (goofle)
-    if len(typo) == len(brand):
-        diff_count = 0
-        is_neighbor = False
-        for c1, c2 in zip(typo, brand):
-            if c1 != c2:
-                diff_count += 1
-                if _is_keyboard_neighbor(c1, c2):
-                    is_neighbor = True
-        if diff_count == 1 and is_neighbor:
-            return "keyboard_neighbor"
-            
-    return "bit_flip" if _edit_distance(typo, brand) == 1 else None
-
-
-def typosquatting_signal(domain: str) -> Optional[Dict[str, Any]]:
+    if (
+        lt == lb
+        and k + 1 < lb
+        and typo[k] == brand[k + 1]
+        and typo[k + 1] == brand[k]
+        and typo[k + 2:] == brand[k + 2:]
+    ):
+        return "transposition"
+
+    # 4. Keyboard Neighbor (goofle): exactly one substitution, by an adjacent key
+    if lt == lb and typo[k + 1:] == brand[k + 1:] and _is_keyboard_neighbor(typo[k], brand[k]):
+        return "keyboard_neighbor"
+
+    return "bit_flip" if _is_single_edit(typo, brand) else None
+
+
+def _typo_signal(sld: str, brand: str, typo_type: str) -> Signal:
+    impact = 32 if typo_type in ["omission", "transposition", "keyboard_neighbor"] else 25
+    return Signal(
+        name="Typosquatting Suspected",
+        category="domain",
+        bucket="structure",
+        impact=impact,
+        confidence=0.8,
+        description=f"Domain '{sld}' appears to be a '{typo_type}' typo of the protected brand '{brand}'.",
+        evidence={"sld": sld, "brand": brand, "type": typo_type},
+    )
+
+
+def _scan_typo(sld: str) -> Optional[Tuple[str, str]]:
+    """Return (brand, typo_type) for the first brand `sld` looks like a typo of."""
+
+    n = len(sld)
+    for brand in _BRAND_LIST:
+        # Every typo type changes the length by at most one character.
+        if abs(len(brand) - n) > 1:
+            continue
+        typo_type = _identify_typo_type(sld, brand)
+        if typo_type:
+            return brand, typo_type
+
+    return None
+
+
+# Hostname label characters; SLDs made only of these are fully covered by _typo_index().
+_TYPO_ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789-"
+_TYPO_CHARS = frozenset(_TYPO_ALPHABET)
+
+
+def _brand_edit_variants(brand: str) -> Iterable[str]:
+    """Every string one insertion/deletion/substitution or adjacent swap away from `brand`."""
+
+    n = len(brand)
+    for i in range(n + 1):
+        head, tail = brand[:i], brand[i:]
+        for c in _TYPO_ALPHABET:
+            yield head + c + tail
+        if i < n:
+            rest = brand[i + 1:]
+            yield head + rest
+            for c in _TYPO_ALPHABET:
+                yield head + c + rest
+            if i < n - 1:
+                yield head + brand[i + 1] + brand[i] + brand[i + 2:]
+
+
+@lru_cache(maxsize=1)
+def _typo_index() -> Dict[str, Tuple[str, str]]:
+    """Map every typo-squatted SLD over _TYPO_ALPHABET to its (brand, typo_type).
+
+    Each typo type is one edit or one adjacent swap of a brand, so enumerating those variants
+    covers every hit _scan_typo can produce for such SLDs; classifying them once here turns the
+    per-request scan into a dict lookup. Built on first use (~14k variants, ~0.2s).
+    """
+
+    index: Dict[str, Tuple[str, str]] = {}
+    for brand in _BRAND_LIST:
+        for variant in _brand_edit_variants(brand):
+            if len(variant) < 4 or variant in index:
+                continue
+            hit = _scan_typo(variant)
+            if hit is not None:
+                index[variant] = hit
+    return index
+
+
+def typosquatting_signal(domain: str, is_reputable: Optional[bool] = None) -> Optional[Signal]:
     sld = _sld(domain)
     if not sld or len(sld) < 4:
         return None
 
     # Skip reputable
-    normalized_domain = domain.lower().strip(".")
-    if normalized_domain.startswith("www."):
-        normalized_domain = normalized_domain[4:]
-    if normalized_domain in TOP_TIER_DOMAINS or reputation_service.is_reputable(domain):
+    if is_reputable is None:
+        is_reputable = _is_reputable(domain)
+    if is_reputable:
         return None
 
-    for brand in BRANDS:
-        typo_type = _identify_typo_type(sld, brand)
-        
-        if typo_type:
-            impact = 32 if typo_type in ["omission", "transposition", "keyboard_neighbor"] else 25
-            return {
-                "name": "Typosquatting Suspected",
-                "category": "domain",
-                "bucket": "structure",
-                "impact": impact,
-                "confidence": 0.8,
-                "description": f"Domain '{sld}' appears to be a '{typo_type}' typo of the protected brand '{brand}'.",
-                "evidence": {"sld": sld, "brand": brand, "type": typo_type},
-            }
+    if _TYPO_CHARS.issuperset(sld):
+        hit = _typo_index().get(sld)
+    else:
+        # Characters outside the precomputed alphabet (e.g. undecoded IDN labels).
+        hit = _scan_typo(sld)
 
+    if hit is not None:
+        return _typo_signal(sld, *hit)
     return None
 
 
-def reputable_domain_signal(domain: str) -> Optional[Dict[str, Any]]:
-    # 1. Check hardcoded top-tier list first (fastest)
+def _strip_www(domain: str) -> str:
     d = domain.lower().strip(".")
     if d.startswith("www."):
         d = d[4:]
+    return d
+
 
-    is_reputable = (d in TOP_TIER_DOMAINS) or reputation_service.is_reputable(domain)
+def _is_reputable(domain: str) -> bool:
+    # Check hardcoded top-tier list first (fastest), then the Tranco list.
+    return (_strip_www(domain) in TOP_TIER_DOMAINS) or reputation_service.is_reputable(domain)
+
+
+def reputable_domain_signal(domain: str, is_reputable: Optional[bool] = None) -> Optional[Signal]:
+    d = _strip_www(domain)
+
+    if is_reputable is None:
+        is_reputable = _is_reputable(domain)
 
     if is_reputable:
-        return {
-            "name": "Top-Tier Reputable Domain",
-            "category": "domain",
-            "bucket": "reputation",
-            "impact": -65,  # Increased trust impact
-            "confidence": 0.98,
-            "description": f"Domain {domain} is recognized as a highly reputable global service.",
-            "evidence": {"domain": d, "source": "Tranco-100K"},
-        }
+        return Signal(
+            name="Top-Tier Reputable Domain",
+            category="domain",
+            bucket="reputation",
+            impact=-65,  # Increased trust impact
+            confidence=0.98,
+            description=f"Domain {domain} is recognized as a highly reputable global service.",
+            evidence={"domain": d, "source": "Tranco-100K"},
+        )
     return None
 
 
-async def domain_signals_async(domain: str) -> List[Dict[str, Any]]:
-    """Asynchronous version of domain_signals that runs I/O in parallel."""
-    
-    # Run DNS and WHOIS lookups in parallel
-    dns_task = dns_overview_async(domain)
-    whois_task = domain_age_days_async(domain)
-    
-    ov, days_meta = await asyncio.gather(dns_task, whois_task)
-    
-    signals: List[Dict[str, Any]] = []
+def _reputable_signals(domain: str) -> Optional[List[Signal]]:
+    """Short signal list for reputable domains, or None when the full checks should run.
+
+    A reputable domain skips WHOIS, DNS and the brand lookalike checks (which exempt reputable
+    domains anyway); only the cheap structural signals are kept. Scoring relies on the
+    "Top-Tier Reputable Domain" marker's large trust impact to keep these low-risk.
+    """
 
+    if not _is_reputable(domain):
+        return None
+
+    signals: List[Signal] = []
     st = suspicious_tld_signal(domain)
     if st:
         signals.append(st)
+    signals.append(reputable_domain_signal(domain, is_reputable=True))
+    ips = idn_punycode_signal(domain)
+    if ips:
+        signals.append(ips)
+    return signals
+
+
+def _build_signals(
+    domain: str,
+    ov: Dict[str, Any],
+    days_meta: Tuple[Optional[int], Dict[str, Any]],
+) -> List[Signal]:
+    """Assemble the domain signals from one DNS overview and one WHOIS result.
 
-    rt = reputable_domain_signal(domain)
-    if rt:
-        signals.append(rt)
+    Only called for non-reputable domains (see _reputable_signals), so the reputable marker is
+    omitted and the lookalike checks skip their own reputation lookup.
+    """
+
+    signals: List[Signal] = []
+
+    st = suspicious_tld_signal(domain)
+    if st:
+        signals.append(st)
 
     signals.append(domain_age_signal(domain, days_meta=days_meta))
     signals.append(registrar_reputation_signal(domain, days_meta=days_meta))
@@ -637,44 +737,56 @@ async def domain_signals_async(domain: str) -> List[Dict[str, Any]]:
     if ips:
         signals.append(ips)
 
-    ts = typosquatting_signal(domain)
+    ts = typosquatting_signal(domain, is_reputable=False)
     if ts:
         signals.append(ts)
 
-    hs = homoglyph_attack_signal(domain)
+    hs = homoglyph_attack_signal(domain, is_reputable=False)
     if hs:
         signals.append(hs)
 
     return signals
 
 
-def domain_signals(domain: str) -> List[Dict[str, Any]]:
-    signals: List[Dict[str, Any]] = []
+async def domain_signals_async(domain: str) -> List[Signal]:
+    """Asynchronous version of domain_signals that runs I/O in parallel."""
 
-    st = suspicious_tld_signal(domain)
-    if st:
-        signals.append(st)
+    fast = _reputable_signals(domain)
+    if fast is not None:
+        return fast
+
+    # Run DNS and WHOIS lookups in parallel
+    ov, days_meta = await asyncio.gather(dns_overview_async(domain), domain_age_days_async(domain))
+    return _build_signals(domain, ov, days_meta)
 
-    rt = reputable_domain_signal(domain)
-    if rt:
-        signals.append(rt)
 
-    signals.append(domain_age_signal(domain))
-    signals.append(registrar_reputation_signal(domain))
-    signals.append(registrar_randomness_signal(domain))
-    signals.extend(dns_validity_signals(domain))
-    signals.append(parked_domain_signal(domain))
+async def domain_signals_many(domains: Iterable[str], concurrency: int = 64) -> Dict[str, List[Signal]]:
+    """Run domain_signals_async for many domains with at most `concurrency` in flight.
 
-    ips = idn_punycode_signal(domain)
-    if ips:
-        signals.append(ips)
+    Duplicates are looked up once. The bound keeps WHOIS/DNS sockets and worker threads in check
+    when a caller hands over a large batch (e.g. every link host in an email).
+    """
 
-    ts = typosquatting_signal(domain)
-    if ts:
-        signals.append(ts)
+    sem = asyncio.Semaphore(max(1, concurrency))
 
-    hs = homoglyph_attack_signal(domain)
-    if hs:
-        signals.append(hs)
+    async def one(d: str) -> Tuple[str, List[Signal]]:
+        async with sem:
+            return d, await domain_signals_async(d)
 
-    return signals
+    return dict(await asyncio.gather(*(one(d) for d in dict.fromkeys(domains))))
+
+
+def domain_signals(domain: str) -> List[Signal]:
+    """Blocking entrypoint for sync callers; the API uses domain_signals_async."""
+
+    fast = _reputable_signals(domain)
+    if fast is not None:
+        return fast
+
+    # One WHOIS and one DNS lookup, shared by every signal that needs them. They don't depend on
+    # each other, so WHOIS (usually the slower one) runs on a worker thread while DNS resolves here.
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="domain-whois") as pool:
+        whois_fut = pool.submit(domain_age_days, domain)
+        ov = dns_overview(domain)
+        days_meta = whois_fut.result()
+    return _build_signals(domain, ov, days_meta)
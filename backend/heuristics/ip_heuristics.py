@@ -2,12 +2,19 @@
 
 import asyncio
 import ipaddress
+import re
 import socket
 from functools import lru_cache
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 
 from ipwhois import IPWhois
 
+from backend.core.signal import Signal
+from backend.persistence.lookup_cache import lookup_cache
+
+
+IPAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+
 
 # NOTE: Country-based scoring is a weak heuristic and should be treated carefully.
 # Keep it small and adjust for your threat model.
@@ -35,6 +42,10 @@ HOSTING_KEYWORDS = {
     "hetzner",
 }
 
+# One compiled scan instead of a Python-level `in` per keyword. (VPN_TOR_KEYWORDS stays a loop:
+# with four keywords and every hit needed for evidence, it measured faster than a regex.)
+_HOSTING_RE = re.compile("|".join(re.escape(k) for k in sorted(HOSTING_KEYWORDS)))
+
 VPN_TOR_KEYWORDS = {
     "vpn",
     "tunnel",
@@ -53,15 +64,90 @@ PROVIDER_CLUSTERS = {
 }
 
 
+# Special-purpose IPv6 ranges are uncommon in benign use and can be suspicious.
+_IPV6_6TO4 = ipaddress.ip_network("2002::/16")
+_IPV6_TEREDO = ipaddress.ip_network("2001:0::/32")
+_IPV6_DOCUMENTATION = ipaddress.ip_network("2001:db8::/32")
+
+
+# Persistent layer under the in-process lru_caches, so restarts don't re-query RDAP/PTR.
+_RDAP_DISK = lookup_cache("rdap", 86400)
+_RDNS_DISK = lookup_cache("rdns", 86400)
+
+
 @lru_cache(maxsize=2048)
 def _rdap_lookup(ip: str) -> Dict[str, Any]:
     # Cached to avoid repeated network lookups for the same IP.
-    return IPWhois(ip).lookup_rdap(depth=1)
+    data = _RDAP_DISK.get(ip)
+    if data is None:
+        data = IPWhois(ip).lookup_rdap(depth=1)
+        _RDAP_DISK.set(ip, data)
+    return data
+
+
+def _reverse_dns(ip: str) -> Optional[str]:
+    # PTR lookup. None when there is no PTR record or the lookup fails.
+    try:
+        return _reverse_dns_cached(ip)
+    except OSError:
+        # Timeouts, EAI_AGAIN, ...: not an answer, so retry next time.
+        return None
+
+
+@lru_cache(maxsize=2048)
+def _reverse_dns_cached(ip: str) -> Optional[str]:
+    # Cached like _rdap_lookup; only definite answers get here, transient errors propagate.
+    host = _RDNS_DISK.get(ip)
+    if host is not None:
+        return host
+    try:
+        host = socket.gethostbyaddr(ip)[0]
+    except (socket.herror, UnicodeError):
+        return None  # no PTR record
+    _RDNS_DISK.set(ip, host)
+    return host
+
+
+class RdapView(NamedTuple):
+    """The RDAP fields the IP signals read, extracted once per analysis."""
+
+    asn: Any
+    asn_description: Any  # as returned, for evidence
+    asn_desc: str  # lowercased, "" when missing
+    network: Optional[str]
+    country_code: str
+    provider_cluster: Optional[str] = None
+    error: Optional[str] = None
+
+
+def _rdap_view(ip: str) -> RdapView:
+    """Look up RDAP for `ip` and extract the fields the signals need.
+
+    Never raises: a failed lookup yields a view carrying the error, which each signal reports
+    the way it used to report its own failed lookup. Failures aren't cached, so they're retried.
+    """
+
+    try:
+        data = _rdap_lookup(ip)
+        asn_description = data.get("asn_description")
+        asn_desc = (asn_description or "").lower()
+        network = (data.get("network", {}) or {}).get("name")
+        return RdapView(
+            asn=data.get("asn"),
+            asn_description=asn_description,
+            asn_desc=asn_desc,
+            network=network,
+            country_code=(data.get("asn_country_code") or "").upper(),
+            # Lowercased once here; the ASN and provider-cluster signals both report it.
+            provider_cluster=_provider_cluster(asn_desc, network),
+        )
+    except Exception as e:
+        return RdapView(asn=None, asn_description=None, asn_desc="", network=None, country_code="", error=str(e))
 
 
-async def _rdap_lookup_async(ip: str) -> Dict[str, Any]:
-    """Asynchronous version of _rdap_lookup using asyncio.to_thread."""
-    return await asyncio.to_thread(_rdap_lookup, ip)
+async def _rdap_view_async(ip: str) -> RdapView:
+    """Asynchronous version of _rdap_view using asyncio.to_thread."""
+    return await asyncio.to_thread(_rdap_view, ip)
 
 
 async def _reverse_dns_async(ip: str) -> Optional[str]:
@@ -69,91 +155,88 @@ async def _reverse_dns_async(ip: str) -> Optional[str]:
     return await asyncio.to_thread(_reverse_dns, ip)
 
 
-def private_public_signal(ip: str) -> Dict[str, Any]:
-    addr = ipaddress.ip_address(ip)
+def private_public_signal(ip: str, addr: Optional[IPAddress] = None) -> Signal:
+    if addr is None:
+        addr = ipaddress.ip_address(ip)
 
     if addr.is_private or addr.is_loopback or addr.is_link_local:
-        return {
-            "name": "Private vs Public IP",
-            "category": "ip",
-            "bucket": "network",
-            "impact": -4,
-            "confidence": 0.9,
-            "description": "IP is non-public (private/loopback/link-local), reducing internet exposure.",
-            "evidence": {"ip": ip, "is_private": True},
-        }
-
-    return {
-        "name": "Private vs Public IP",
-        "category": "ip",
-        "bucket": "network",
-        "impact": 0,
-        "confidence": 0.7,
-        "description": "IP is publicly routable.",
-        "evidence": {"ip": ip, "is_private": False},
-    }
-
-
-def ipv6_specific_signal(ip: str) -> Dict[str, Any]:
-    addr = ipaddress.ip_address(ip)
+        return Signal(
+            name="Private vs Public IP",
+            category="ip",
+            bucket="network",
+            impact=-4,
+            confidence=0.9,
+            description="IP is non-public (private/loopback/link-local), reducing internet exposure.",
+            evidence={"ip": ip, "is_private": True},
+        )
+
+    return Signal(
+        name="Private vs Public IP",
+        category="ip",
+        bucket="network",
+        impact=0,
+        confidence=0.7,
+        description="IP is publicly routable.",
+        evidence={"ip": ip, "is_private": False},
+    )
+
+
+def ipv6_specific_signal(ip: str, addr: Optional[IPAddress] = None) -> Signal:
+    if addr is None:
+        addr = ipaddress.ip_address(ip)
     if addr.version != 6:
-        return {
-            "name": "IPv6 Specific Heuristics",
-            "category": "ip",
-            "bucket": "network",
-            "impact": 0,
-            "confidence": 0.3,
-            "description": "Not an IPv6 address; IPv6-specific heuristics not applicable.",
-            "evidence": {"ip": ip},
-        }
-
-    # Special-purpose IPv6 ranges are uncommon in benign use and can be suspicious.
-    six_to_four = ipaddress.ip_network("2002::/16")
-    teredo = ipaddress.ip_network("2001:0::/32")
-    documentation = ipaddress.ip_network("2001:db8::/32")
-
-    if addr in documentation:
-        return {
-            "name": "IPv6 Specific Heuristics",
-            "category": "ip",
-            "bucket": "network",
-            "impact": 10,
-            "confidence": 0.7,
-            "description": "IP is in the IPv6 documentation range (unlikely to be legitimate on the public internet).",
-            "evidence": {"ip": ip, "range": "2001:db8::/32"},
-        }
-
-    if addr in six_to_four:
-        return {
-            "name": "IPv6 Specific Heuristics",
-            "category": "ip",
-            "bucket": "network",
-            "impact": 8,
-            "confidence": 0.6,
-            "description": "IP is in the 6to4 range (transition mechanism; can be abused).",
-            "evidence": {"ip": ip, "range": "2002::/16"},
-        }
-
-    if addr in teredo:
-        return {
-            "name": "IPv6 Specific Heuristics",
-            "category": "ip",
-            "bucket": "network",
-            "impact": 8,
-            "confidence": 0.6,
-            "description": "IP is in the Teredo range (transition mechanism; can be abused).",
-            "evidence": {"ip": ip, "range": "2001:0::/32"},
-        }
-
-    return {
-        "name": "IPv6 Specific Heuristics",
-        "category": "ip",
-        "bucket": "network",
-        "impact": 0,
-        "confidence": 0.45,
-        "description": "IPv6 address did not match special transition/documentation ranges.",
-        "evidence": {"ip": ip},
-    }
+        return Signal(
+            name="IPv6 Specific Heuristics",
+            category="ip",
+            bucket="network",
+            impact=0,
+            confidence=0.3,
+            description="Not an IPv6 address; IPv6-specific heuristics not applicable.",
+            evidence={"ip": ip},
+        )
+
+    if addr in _IPV6_DOCUMENTATION:
+        return Signal(
+            name="IPv6 Specific Heuristics",
+            category="ip",
+            bucket="network",
+            impact=10,
+            confidence=0.7,
+            description="IP is in the IPv6 documentation range (unlikely to be legitimate on the public internet).",
+            evidence={"ip": ip, "range": "2001:db8::/32"},
+        )
+
+    if addr in _IPV6_6TO4:
+        return Signal(
+            name="IPv6 Specific Heuristics",
+            category="ip",
+            bucket="network",
+            impact=8,
+            confidence=0.6,
+            description="IP is in the 6to4 range (transition mechanism; can be abused).",
+            evidence={"ip": ip, "range": "2002::/16"},
+        )
+
+    if addr in _IPV6_TEREDO:
+        return Signal(
+            name="IPv6 Specific Heuristics",
+            category="ip",
+            bucket="network",
+            impact=8,
+            confidence=0.6,
+            description="IP is in the Teredo range (transition mechanism; can be abused).",
+            evidence={"ip": ip, "range": "2001:0::/32"},
+        )
+
+    return Signal(
+        name="IPv6 Specific Heuristics",
+        category="ip",
+        bucket="network",
+        impact=0,
+        confidence=0.45,
+        description="IPv6 address did not match special transition/documentation ranges.",
+        evidence={"ip": ip},
+    )
 
 
 def _provider_cluster(asn_desc: str, net_name: Optional[str]) -> Optional[str]:
@@ -164,167 +247,149 @@ def _provider_cluster(asn_desc: str, net_name: Optional[str]) -> Optional[str]:
     return None
 
 
-def asn_isp_type_signal(ip: str, rdap_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    try:
-        if rdap_data is None:
-            data = _rdap_lookup(ip)
-        else:
-            data = rdap_data
-        
-        asn = data.get("asn")
-        asn_desc = (data.get("asn_description") or "").lower()
-        net_name = (data.get("network", {}) or {}).get("name")
-
-        is_hosting = any(k in asn_desc for k in HOSTING_KEYWORDS)
-        provider = _provider_cluster(asn_desc, net_name)
-
-        if is_hosting:
-            return {
-                "name": "ASN / ISP Type",
-                "category": "ip",
-                "bucket": "network",
-                "impact": 10,
-                "confidence": 0.65,
-                "description": "ASN description suggests hosting/cloud infrastructure (often abused at scale).",
-                "evidence": {
-                    "asn": asn,
-                    "asn_description": data.get("asn_description"),
-                    "network": net_name,
-                    "provider_cluster": provider,
-                },
-            }
-
-        return {
-            "name": "ASN / ISP Type",
-            "category": "ip",
-            "bucket": "network",
-            "impact": 0,
-            "confidence": 0.55,
-            "description": "ASN does not strongly indicate hosting/cloud infrastructure.",
-            "evidence": {
-                "asn": asn,
-                "asn_description": data.get("asn_description"),
-                "network": net_name,
+def asn_isp_type_signal(ip: str, rdap: Optional[RdapView] = None) -> Signal:
+    if rdap is None:
+        rdap = _rdap_view(ip)
+
+    if rdap.error is not None:
+        return Signal(
+            name="ASN / ISP Type",
+            category="ip",
+            bucket="network",
+            impact=0,
+            confidence=0.2,
+            description="ASN lookup failed (could not determine ISP type).",
+            evidence={"error": rdap.error},
+        )
+
+    is_hosting = _HOSTING_RE.search(rdap.asn_desc) is not None
+    provider = rdap.provider_cluster
+
+    if is_hosting:
+        return Signal(
+            name="ASN / ISP Type",
+            category="ip",
+            bucket="network",
+            impact=10,
+            confidence=0.65,
+            description="ASN description suggests hosting/cloud infrastructure (often abused at scale).",
+            evidence={
+                "asn": rdap.asn,
+                "asn_description": rdap.asn_description,
+                "network": rdap.network,
                 "provider_cluster": provider,
             },
-        }
-
-    except Exception as e:
-        return {
-            "name": "ASN / ISP Type",
-            "category": "ip",
-            "bucket": "network",
-            "impact": 0,
-            "confidence": 0.2,
-            "description": "ASN lookup failed (could not determine ISP type).",
-            "evidence": {"error": str(e)},
-        }
-
-
-def hosting_provider_cluster_signal(ip: str, rdap_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        )
+
+    return Signal(
+        name="ASN / ISP Type",
+        category="ip",
+        bucket="network",
+        impact=0,
+        confidence=0.55,
+        description="ASN does not strongly indicate hosting/cloud infrastructure.",
+        evidence={
+            "asn": rdap.asn,
+            "asn_description": rdap.asn_description,
+            "network": rdap.network,
+            "provider_cluster": provider,
+        },
+    )
+
+
+def hosting_provider_cluster_signal(ip: str, rdap: Optional[RdapView] = None) -> Signal:
     """Provide a lightweight provider grouping for auditability and clustering."""
 
-    try:
-        if rdap_data is None:
-            data = _rdap_lookup(ip)
-        else:
-            data = rdap_data
-        
-        asn_desc = data.get("asn_description") or ""
-        net_name = (data.get("network", {}) or {}).get("name")
-
-        provider = _provider_cluster(str(asn_desc), str(net_name) if net_name else None)
-        if provider:
-            return {
-                "name": "Hosting Provider Cluster",
-                "category": "ip",
-                "bucket": "network",
-                "impact": 6,
-                "confidence": 0.55,
-                "description": "IP appears to belong to a major hosting/cloud provider cluster.",
-                "evidence": {"provider_cluster": provider, "asn_description": asn_desc, "network": net_name},
-            }
-
-        return {
-            "name": "Hosting Provider Cluster",
-            "category": "ip",
-            "bucket": "network",
-            "impact": 0,
-            "confidence": 0.35,
-            "description": "No hosting provider cluster matched.",
-            "evidence": {"asn_description": asn_desc, "network": net_name},
-        }
-
-    except Exception as e:
-        return {
-            "name": "Hosting Provider Cluster",
-            "category": "ip",
-            "bucket": "network",
-            "impact": 0,
-            "confidence": 0.2,
-            "description": "Provider clustering could not be computed.",
-            "evidence": {"error": str(e)},
-        }
-
-
-def country_risk_signal(ip: str, rdap_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    try:
-        if rdap_data is None:
-            data = _rdap_lookup(ip)
-        else:
-            data = rdap_data
-        
-        cc = (data.get("asn_country_code") or "").upper()
-        risk = COUNTRY_RISK.get(cc, 0)
-
-        if risk > 0:
-            return {
-                "name": "Country Risk",
-                "category": "ip",
-                "bucket": "network",
-                "impact": risk,
-                "confidence": 0.45,
-                "description": "Country-based risk heuristic triggered (weak signal; threat-model dependent).",
-                "evidence": {"country_code": cc, "risk": risk},
-            }
-
-        return {
-            "name": "Country Risk",
-            "category": "ip",
-            "bucket": "network",
-            "impact": 0,
-            "confidence": 0.35,
-            "description": "No country risk heuristic triggered.",
-            "evidence": {"country_code": cc},
-        }
-
-    except Exception as e:
-        return {
-            "name": "Country Risk",
-            "category": "ip",
-            "bucket": "network",
-            "impact": 0,
-            "confidence": 0.2,
-            "description": "Country lookup failed.",
-            "evidence": {"error": str(e)},
-        }
-
-
-def tor_vpn_indicators_signal(ip: str, rdns_data: Optional[str] = None, rdap_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    if rdap is None:
+        rdap = _rdap_view(ip)
+
+    if rdap.error is not None:
+        return Signal(
+            name="Hosting Provider Cluster",
+            category="ip",
+            bucket="network",
+            impact=0,
+            confidence=0.2,
+            description="Provider clustering could not be computed.",
+            evidence={"error": rdap.error},
+        )
+
+    asn_desc = rdap.asn_description or ""
+    net_name = rdap.network
+
+    provider = rdap.provider_cluster
+    if provider:
+        return Signal(
+            name="Hosting Provider Cluster",
+            category="ip",
+            bucket="network",
+            impact=6,
+            confidence=0.55,
+            description="IP appears to belong to a major hosting/cloud provider cluster.",
+            evidence={"provider_cluster": provider, "asn_description": asn_desc, "network": net_name},
+        )
+
+    return Signal(
+        name="Hosting Provider Cluster",
+        category="ip",
+        bucket="network",
+        impact=0,
+        confidence=0.35,
+        description="No hosting provider cluster matched.",
+        evidence={"asn_description": asn_desc, "network": net_name},
+    )
+
+
+def country_risk_signal(ip: str, rdap: Optional[RdapView] = None) -> Signal:
+    if rdap is None:
+        rdap = _rdap_view(ip)
+
+    if rdap.error is not None:
+        return Signal(
+            name="Country Risk",
+            category="ip",
+            bucket="network",
+            impact=0,
+            confidence=0.2,
+            description="Country lookup failed.",
+            evidence={"error": rdap.error},
+        )
+
+    cc = rdap.country_code
+    risk = COUNTRY_RISK.get(cc, 0)
+
+    if risk > 0:
+        return Signal(
+            name="Country Risk",
+            category="ip",
+            bucket="network",
+            impact=risk,
+            confidence=0.45,
+            description="Country-based risk heuristic triggered (weak signal; threat-model dependent).",
+            evidence={"country_code": cc, "risk": risk},
+        )
+
+    return Signal(
+        name="Country Risk",
+        category="ip",
+        bucket="network",
+        impact=0,
+        confidence=0.35,
+        description="No country risk heuristic triggered.",
+        evidence={"country_code": cc},
+    )
+
+
+def tor_vpn_indicators_signal(ip: str, rdns_data: Optional[str] = None, rdap: Optional[RdapView] = None) -> Signal:
     if rdns_data is None:
         rdns = _reverse_dns(ip) or ""
     else:
         rdns = rdns_data or ""
 
-    try:
-        if rdap_data is None:
-            data = _rdap_lookup(ip)
-        else:
-            data = rdap_data
-        
-        asn_desc = (data.get("asn_description") or "").lower()
-    except Exception:
-        asn_desc = ""
+    if rdap is None:
+        rdap = _rdap_view(ip)
+    # A failed lookup leaves asn_desc empty, so only reverse DNS is checked.
+    asn_desc = rdap.asn_desc
 
     hits: List[str] = []
     for k in VPN_TOR_KEYWORDS:
@@ -332,52 +397,73 @@ def tor_vpn_indicators_signal(ip: str, rdns_data: Optional[str] = None, rdap_dat
             hits.append(k)
 
     if hits:
-        return {
-            "name": "TOR/VPN Indicators",
-            "category": "ip",
-            "bucket": "network",
-            "impact": 18,
-            "confidence": 0.55,
-            "description": "Reverse DNS / ASN description suggest VPN/proxy/TOR-like infrastructure.",
-            "evidence": {"reverse_dns": rdns or None, "asn_description": asn_desc or None, "hits": sorted(set(hits))},
-        }
-
-    return {
-        "name": "TOR/VPN Indicators",
-        "category": "ip",
-        "bucket": "network",
-        "impact": 0,
-        "confidence": 0.35,
-        "description": "No obvious TOR/VPN indicators found via reverse DNS / ASN keywords.",
-        "evidence": {"reverse_dns": rdns or None},
-    }
-
-
-async def ip_signals_async(ip: str) -> List[Dict[str, Any]]:
+        return Signal(
+            name="TOR/VPN Indicators",
+            category="ip",
+            bucket="network",
+            impact=18,
+            confidence=0.55,
+            description="Reverse DNS / ASN description suggest VPN/proxy/TOR-like infrastructure.",
+            evidence={"reverse_dns": rdns or None, "asn_description": asn_desc or None, "hits": sorted(set(hits))},
+        )
+
+    return Signal(
+        name="TOR/VPN Indicators",
+        category="ip",
+        bucket="network",
+        impact=0,
+        confidence=0.35,
+        description="No obvious TOR/VPN indicators found via reverse DNS / ASN keywords.",
+        evidence={"reverse_dns": rdns or None},
+    )
+
+
+async def ip_signals_async(ip: str) -> List[Signal]:
     """Asynchronous version of ip_signals that runs I/O in parallel."""
     
     # Run RDAP and Reverse DNS lookups in parallel
-    rdap_task = _rdap_lookup_async(ip)
+    rdap_task = _rdap_view_async(ip)
     rdns_task = _reverse_dns_async(ip)
     
-    rdap_data, rdns_data = await asyncio.gather(rdap_task, rdns_task)
+    rdap, rdns_data = await asyncio.gather(rdap_task, rdns_task)
+    addr = ipaddress.ip_address(ip)
     
     return [
-        private_public_signal(ip),
-        ipv6_specific_signal(ip),
-        asn_isp_type_signal(ip, rdap_data=rdap_data),
-        hosting_provider_cluster_signal(ip, rdap_data=rdap_data),
-        country_risk_signal(ip, rdap_data=rdap_data),
-        tor_vpn_indicators_signal(ip, rdns_data=rdns_data, rdap_data=rdap_data),
+        private_public_signal(ip, addr=addr),
+        ipv6_specific_signal(ip, addr=addr),
+        asn_isp_type_signal(ip, rdap=rdap),
+        hosting_provider_cluster_signal(ip, rdap=rdap),
+        country_risk_signal(ip, rdap=rdap),
+        tor_vpn_indicators_signal(ip, rdns_data=rdns_data, rdap=rdap),
     ]
 
 
-def ip_signals(ip: str) -> List[Dict[str, Any]]:
+async def ip_signals_many(ips: Iterable[str], concurrency: int = 20) -> Dict[str, List[Signal]]:
+    """Run ip_signals_async for many IPs with at most `concurrency` in flight.
+
+    Duplicates are looked up once. The bound is lower than domain_signals_many's because RDAP
+    registries rate-limit aggressively.
+    """
+
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(ip: str) -> Tuple[str, List[Signal]]:
+        async with sem:
+            return ip, await ip_signals_async(ip)
+
+    return dict(await asyncio.gather(*(one(ip) for ip in dict.fromkeys(ips))))
+
+
+def ip_signals(ip: str) -> List[Signal]:
+    # Parse once; both address-shape signals share it.
+    addr = ipaddress.ip_address(ip)
+    # One RDAP lookup/extraction, shared by every signal that reads it.
+    rdap = _rdap_view(ip)
     return [
-        private_public_signal(ip),
-        ipv6_specific_signal(ip),
-        asn_isp_type_signal(ip),
-        hosting_provider_cluster_signal(ip),
-        country_risk_signal(ip),
-        tor_vpn_indicators_signal(ip),
+        private_public_signal(ip, addr=addr),
+        ipv6_specific_signal(ip, addr=addr),
+        asn_isp_type_signal(ip, rdap=rdap),
+        hosting_provider_cluster_signal(ip, rdap=rdap),
+        country_risk_signal(ip, rdap=rdap),
+        tor_vpn_indicators_signal(ip, rdap=rdap),
     ]
@@ -2,11 +2,59 @@ from __future__ import annotations
 
 import ssl
 import socket
-from datetime import datetime
-from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Union
 from urllib.parse import urlparse
 
+from backend.core.signal import Signal
+from backend.utils.ttl_cache import TTLCache, ttl_from_env
+from backend.utils.validators import ParsedTarget
+
+_MONTHS = {
+    name: i
+    for i, name in enumerate(("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1)
+}
+
+
+def _parse_cert_time(value: str) -> datetime:
+    """Parse ssl's fixed notAfter format ('May 26 23:59:59 2024 GMT') without strptime."""
+
+    parts = value.split()
+    month = _MONTHS.get(parts[0]) if len(parts) == 5 else None
+    if month is None or parts[4] not in ("GMT", "UTC"):
+        raise ValueError(f"unrecognized certificate time {value!r}")
+    hour, minute, second = parts[2].split(":")
+    return datetime(int(parts[3]), month, int(parts[1]), int(hour), int(minute), int(second), tzinfo=timezone.utc)
+
+
+# Certificates change rarely; failed handshakes are remembered briefly so a down host isn't
+# retried on every request but recovers within a minute (even if the global TTL is raised).
+_CERT_CACHE = TTLCache(maxsize=1024, ttl_seconds=ttl_from_env(600))
+_CERT_FAILURES = TTLCache(maxsize=1024, ttl_seconds=min(60, ttl_from_env(60)))
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Stats of the certificate and failure caches, for the analyzer cache status endpoint."""
+    return {"ok": _CERT_CACHE.stats(), "failures": _CERT_FAILURES.stats()}
+
+
 def get_certificate_info(hostname: str, timeout: float = 3.0) -> Optional[Dict[str, Any]]:
+    key = hostname.lower()
+    cert = _CERT_CACHE.get(key)
+    if cert is not None:
+        return cert
+    if _CERT_FAILURES.get(key):
+        return None
+
+    cert = _fetch_certificate(hostname, timeout)
+    if cert:
+        _CERT_CACHE.set(key, cert)
+    else:
+        _CERT_FAILURES.set(key, True)
+    return cert
+
+
+def _fetch_certificate(hostname: str, timeout: float) -> Optional[Dict[str, Any]]:
     context = ssl.create_default_context()
     try:
         with socket.create_connection((hostname, 443), timeout=timeout) as sock:
@@ -16,34 +64,41 @@ def get_certificate_info(hostname: str, timeout: float = 3.0) -> Optional[Dict[s
     except Exception:
         return None
 
-def ssl_certificate_signal(url: str) -> Dict[str, Any]:
+
+def ssl_certificate_signal(url: Union[str, ParsedTarget]) -> Signal:
     """
     Check SSL certificate validity and properties.
+
+    Accepts a ParsedTarget so the URL pipeline doesn't parse the same URL again.
     """
     try:
-        parsed = urlparse(url)
-        if parsed.scheme != "https":
-             return {
-                "name": "SSL Certificate",
-                "category": "network",
-                "bucket": "network",
-                "impact": 5,
-                "confidence": 0.8,
-                "description": "URL does not use HTTPS.",
-                "evidence": {"scheme": parsed.scheme}
-            }
+        if isinstance(url, ParsedTarget):
+            scheme, hostname = url.scheme, url.host or None
+        else:
+            parsed = urlparse(url)
+            scheme, hostname = parsed.scheme, parsed.hostname
+
+        if scheme != "https":
+             return Signal(
+                name="SSL Certificate",
+                category="network",
+                bucket="network",
+                impact=5,
+                confidence=0.8,
+                description="URL does not use HTTPS.",
+                evidence={"scheme": scheme}
+            )
             
-        hostname = parsed.hostname
         if not hostname:
-             return {
-                "name": "SSL Certificate",
-                "category": "network",
-                "bucket": "network",
-                "impact": 0,
-                "confidence": 0.0,
-                "description": "Could not determine hostname.",
-                "evidence": {}
-            }
+             return Signal(
+                name="SSL Certificate",
+                category="network",
+                bucket="network",
+                impact=0,
+                confidence=0.0,
+                description="Could not determine hostname.",
+                evidence={}
+            )
 
         # In a real heuristic, we'd do a proper handshake
         # For now, we'll do a basic connection check if possible, or just return a placeholder
@@ -52,15 +107,15 @@ def ssl_certificate_signal(url: str) -> Dict[str, Any]:
         
         cert = get_certificate_info(hostname)
         if not cert:
-            return {
-                "name": "SSL Certificate",
-                "category": "network",
-                "bucket": "network",
-                "impact": 15,
-                "confidence": 0.6,
-                "description": "HTTPS connection failed or certificate invalid.",
-                "evidence": {"error": "Connection failed"}
-            }
+            return Signal(
+                name="SSL Certificate",
+                category="network",
+                bucket="network",
+                impact=15,
+                confidence=0.6,
+                description="HTTPS connection failed or certificate invalid.",
+                evidence={"error": "Connection failed"}
+            )
 
         # Check expiration
         not_after_str = cert.get('notAfter')
@@ -68,58 +123,58 @@ def ssl_certificate_signal(url: str) -> Dict[str, Any]:
             # format: 'May 26 23:59:59 2024 GMT'
             # Python's ssl module returns this format
             try:
-                not_after = datetime.strptime(not_after_str, r"%b %d %H:%M:%S %Y %Z")
-                remaining = (not_after - datetime.now()).days
+                not_after = _parse_cert_time(not_after_str)
+                remaining = (not_after - datetime.now(timezone.utc)).days
                 
                 if remaining < 0:
-                    return {
-                        "name": "SSL Certificate",
-                        "category": "network",
-                        "bucket": "network",
-                        "impact": 40,
-                        "confidence": 0.9,
-                        "description": "SSL certificate has expired.",
-                        "evidence": {"expiration": not_after_str, "days_remaining": remaining}
-                    }
+                    return Signal(
+                        name="SSL Certificate",
+                        category="network",
+                        bucket="network",
+                        impact=40,
+                        confidence=0.9,
+                        description="SSL certificate has expired.",
+                        evidence={"expiration": not_after_str, "days_remaining": remaining}
+                    )
                 elif remaining < 7:
-                     return {
-                        "name": "SSL Certificate",
-                        "category": "network",
-                        "bucket": "network",
-                        "impact": 10,
-                        "confidence": 0.8,
-                        "description": "SSL certificate expires very soon.",
-                        "evidence": {"expiration": not_after_str, "days_remaining": remaining}
-                     }
+                     return Signal(
+                        name="SSL Certificate",
+                        category="network",
+                        bucket="network",
+                        impact=10,
+                        confidence=0.8,
+                        description="SSL certificate expires very soon.",
+                        evidence={"expiration": not_after_str, "days_remaining": remaining}
+                     )
             except Exception as e:
-                return {
-                    "name": "SSL Certificate",
-                    "category": "network",
-                    "bucket": "network",
-                    "impact": 0,
-                    "confidence": 0.3,
-                    "description": f"SSL date parsing error: {str(e)}",
-                    "evidence": {"error": str(e)}
-                }
+                return Signal(
+                    name="SSL Certificate",
+                    category="network",
+                    bucket="network",
+                    impact=0,
+                    confidence=0.3,
+                    description=f"SSL date parsing error: {str(e)}",
+                    evidence={"error": str(e)}
+                )
 
         issuer_str = str(cert.get('issuer'))
-        return {
-            "name": "SSL Certificate",
-            "category": "network",
-            "bucket": "network",
-            "impact": 0,
-            "confidence": 0.7,
-            "description": "Valid SSL certificate found.",
-            "evidence": {"issuer": issuer_str[:50] + "..."}
-        }
+        return Signal(
+            name="SSL Certificate",
+            category="network",
+            bucket="network",
+            impact=0,
+            confidence=0.7,
+            description="Valid SSL certificate found.",
+            evidence={"issuer": issuer_str[:50] + "..."}
+        )
 
     except Exception as e:
-        return {
-            "name": "SSL Certificate",
-            "category": "network",
-            "bucket": "network",
-            "impact": 0,
-            "confidence": 0.3,
-            "description": f"SSL check error: {str(e)}",
-            "evidence": {"error": str(e)}
-        }
+        return Signal(
+            name="SSL Certificate",
+            category="network",
+            bucket="network",
+            impact=0,
+            confidence=0.3,
+            description=f"SSL check error: {str(e)}",
+            evidence={"error": str(e)}
+        )
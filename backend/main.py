@@ -3,7 +3,7 @@
 from backend.api.analyze import router as analyze_router
 from backend.api.explain import router as explain_router
 from backend.api.history import router as history_router
-from backend.persistence.sqlite_store import init_db
+from backend.persistence.sqlite_store import init_db, start_writer, stop_writer
 from backend.utils.reputation import reputation_service
 
 
@@ -22,6 +22,14 @@ def create_app() -> FastAPI:
         init_db()
         reputation_service.load_dataset()
 
+    @app.on_event("startup")
+    async def _start_writer() -> None:
+        await start_writer()
+
+    @app.on_event("shutdown")
+    async def _stop_writer() -> None:
+        await stop_writer()
+
     app.include_router(analyze_router, prefix="/api")
     app.include_router(history_router, prefix="/api")
     app.include_router(explain_router, prefix="/api")
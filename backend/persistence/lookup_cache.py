@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from backend.utils.ttl_cache import ttl_from_env
+
+
+logger = logging.getLogger("security_analyzer")
+
+_conn: Optional[sqlite3.Connection] = None
+_conn_path: Optional[Path] = None
+_lock = threading.Lock()
+
+
+def _default_cache_path() -> Path:
+    # backend/persistence/lookup_cache.py -> backend/data/lookup_cache.sqlite3
+    backend_dir = Path(__file__).resolve().parents[1]
+    return backend_dir / "data" / "lookup_cache.sqlite3"
+
+
+def get_cache_path() -> Path:
+    p = os.environ.get("SECURITY_ANALYZER_LOOKUP_CACHE_PATH")
+    return Path(p) if p else _default_cache_path()
+
+
+def _connection() -> sqlite3.Connection:
+    """Shared connection (callers hold _lock); reopened if the configured path changes."""
+
+    global _conn, _conn_path
+
+    path = get_cache_path()
+    if _conn is not None and _conn_path == path:
+        return _conn
+    if _conn is not None:
+        _conn.close()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=5.0, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS lookup_cache (
+          namespace TEXT NOT NULL,
+          key TEXT NOT NULL,
+          value_json TEXT NOT NULL,
+          expires_at REAL NOT NULL,
+          PRIMARY KEY (namespace, key)
+        )
+        """
+    )
+    # Drop whatever expired while the process was down.
+    conn.execute("DELETE FROM lookup_cache WHERE expires_at <= ?", (time.time(),))
+    conn.commit()
+
+    _conn, _conn_path = conn, path
+    return conn
+
+
+class LookupCache:
+    """Persistent TTL cache for slow network lookups (RDAP, reverse DNS, ...).
+
+    Backed by a small SQLite file so results survive restarts. Values are stored as JSON; expired
+    rows are ignored on read and pruned when the file is opened. Any SQLite error is logged and
+    treated as a miss, so the cache can never fail a lookup. A TTL of 0 (e.g. via
+    SECURITY_ANALYZER_CACHE_TTL=0) disables it.
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: float) -> None:
+        self.namespace = namespace
+        self.ttl_seconds = float(ttl_seconds)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self.ttl_seconds <= 0:
+            return default
+        try:
+            with _lock:
+                row = _connection().execute(
+                    "SELECT value_json, expires_at FROM lookup_cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                ).fetchone()
+            if row is None or row[1] <= time.time():
+                return default
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning("Lookup cache read failed (%s): %s", self.namespace, e)
+            return default
+
+    def set(self, key: str, value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        try:
+            payload = json.dumps(value, default=str)
+            with _lock:
+                conn = _connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO lookup_cache (namespace, key, value_json, expires_at) VALUES (?, ?, ?, ?)",
+                    (self.namespace, key, payload, time.time() + self.ttl_seconds),
+                )
+                conn.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning("Lookup cache write failed (%s): %s", self.namespace, e)
+
+
+def lookup_cache(namespace: str, default_ttl_seconds: float) -> LookupCache:
+    return LookupCache(namespace, ttl_from_env(default_ttl_seconds))
@@ -1,12 +1,36 @@
 ﻿from __future__ import annotations
 
+import asyncio
 import json
+import logging
 import os
 import sqlite3
-from contextlib import contextmanager
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+logger = logging.getLogger("security_analyzer")
+
+# Background writer: bounded so a slow disk can't grow memory without limit.
+_QUEUE_MAXSIZE = 1024
+_WRITE_BATCH = 64
+
+Pending = Tuple[Dict[str, Any], Dict[str, Any]]
+
+_queue: Optional["asyncio.Queue[Pending]"] = None
+_writer_task: Optional["asyncio.Task[None]"] = None
+
+# One connection per thread, opened (and PRAGMA-configured) once and reused for the life of the
+# thread. In-process writers still take _write_lock so batches never contend with each other.
+_local = threading.local()
+_write_lock = threading.Lock()
 
 
 def _default_db_path() -> Path:
@@ -20,9 +44,7 @@ def get_db_path() -> Path:
     return Path(p) if p else _default_db_path()
 
 
-@contextmanager
-def _connect() -> Iterator[sqlite3.Connection]:
-    db_path = get_db_path()
+def _open(db_path: Path) -> sqlite3.Connection:
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Use a longer timeout and check_same_thread=False for FastAPI concurrency.
@@ -35,115 +57,251 @@ def _connect() -> Iterator[sqlite3.Connection]:
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA synchronous=NORMAL")
     conn.execute("PRAGMA foreign_keys = ON")
+    # Let reads come straight from the OS page cache instead of read() syscalls.
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
 
-    try:
-        yield conn
-    finally:
+
+def _connection() -> sqlite3.Connection:
+    """This thread's connection; reopened if the configured DB path changes."""
+
+    db_path = get_db_path()
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.path == db_path:
+        return conn
+    if conn is not None:
         conn.close()
 
+    conn = _open(db_path)
+    _local.conn, _local.path = conn, db_path
+    return conn
+
 
 def init_db() -> None:
-    with _connect() as conn:
-        # Tables are created within an implicit transaction.
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS analyses (
-              id INTEGER PRIMARY KEY AUTOINCREMENT,
-              target TEXT NOT NULL,
-              type TEXT NOT NULL,
-              risk_score INTEGER NOT NULL,
-              verdict TEXT NOT NULL,
-              confidence REAL NOT NULL,
-              created_at TEXT NOT NULL
-            )
-            """
+    conn = _connection()
+    # Tables are created within an implicit transaction.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS analyses (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          target TEXT NOT NULL,
+          type TEXT NOT NULL,
+          risk_score INTEGER NOT NULL,
+          verdict TEXT NOT NULL,
+          confidence REAL NOT NULL,
+          created_at TEXT NOT NULL
         )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS analysis_explain (
-              analysis_id INTEGER PRIMARY KEY,
-              explain_json TEXT NOT NULL,
-              FOREIGN KEY (analysis_id) REFERENCES analyses(id) ON DELETE CASCADE
-            )
-            """
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS analysis_explain (
+          analysis_id INTEGER PRIMARY KEY,
+          explain_json TEXT NOT NULL,
+          FOREIGN KEY (analysis_id) REFERENCES analyses(id) ON DELETE CASCADE
         )
-        # Create an index on target for faster future lookups/history search
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_target ON analyses(target)")
-        conn.commit()
+        """
+    )
+    # Create an index on target for faster future lookups/history search
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_target ON analyses(target)")
+    conn.commit()
+
+
+def _dumps(obj: Any) -> str:
+    if orjson is not None:
+        try:
+            # Datetimes go through default=str like the stdlib path, so stored strings don't change.
+            return orjson.dumps(
+                obj, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            ).decode()
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib encoder handles those
+    return json.dumps(obj, default=str)
+
+
+def _loads(raw: str) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def save_analysis(result: Dict[str, Any], explain: Dict[str, Any]) -> int:
-    """Persist one analysis atomically.
-
-    The public /api/analyze response is not modified, but we store additional explain data.
-    """
+def save_analyses(items: Sequence[Pending]) -> List[int]:
+    """Persist analyses in a single transaction, returning their ids in order."""
 
     created_at = _utc_now_iso()
+    ids: List[int] = []
 
-    with _connect() as conn:
+    with _write_lock:
+        conn = _connection()
         try:
-            # Start an explicit transaction for atomicity
+            # One explicit transaction for the whole batch: atomic, and a single commit.
             conn.execute("BEGIN TRANSACTION")
-            
-            cur = conn.execute(
-                """
-                INSERT INTO analyses (target, type, risk_score, verdict, confidence, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    str(result.get("target")),
-                    str(result.get("type")),
-                    int(result.get("risk_score", 0)),
-                    str(result.get("verdict")),
-                    float(result.get("confidence", 0.0)),
-                    created_at,
-                ),
-            )
-            analysis_id = int(cur.lastrowid)
 
-            conn.execute(
+            for result, explain in items:
+                cur = conn.execute(
+                    """
+                    INSERT INTO analyses (target, type, risk_score, verdict, confidence, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        str(result.get("target")),
+                        str(result.get("type")),
+                        int(result.get("risk_score", 0)),
+                        str(result.get("verdict")),
+                        float(result.get("confidence", 0.0)),
+                        created_at,
+                    ),
+                )
+                ids.append(int(cur.lastrowid))
+
+            conn.executemany(
                 """
                 INSERT INTO analysis_explain (analysis_id, explain_json)
                 VALUES (?, ?)
                 """,
-                (analysis_id, json.dumps(explain, default=str)),
+                [
+                    (analysis_id, _dumps(explain))
+                    for analysis_id, (_, explain) in zip(ids, items)
+                ],
             )
 
             conn.execute("COMMIT")
-            return analysis_id
+            return ids
         except Exception as e:
             conn.execute("ROLLBACK")
             logger.error(f"Atomic save_analysis failed, transaction rolled back: {e}")
             raise e
 
 
+def save_analysis(result: Dict[str, Any], explain: Dict[str, Any]) -> int:
+    """Persist one analysis atomically.
+
+    The public /api/analyze response is not modified, but we store additional explain data.
+    """
+
+    return save_analyses([(result, explain)])[0]
+
+
+def enqueue_analysis(result: Dict[str, Any], explain: Dict[str, Any]) -> Optional[int]:
+    """Hand an analysis to the background writer.
+
+    Returns None when queued (the id is assigned by SQLite at write time). If the writer isn't
+    running or the queue is full, the analysis is written inline and its id returned, so nothing
+    is silently dropped.
+    """
+
+    if _queue is not None:
+        try:
+            _queue.put_nowait((result, explain))
+            return None
+        except asyncio.QueueFull:
+            logger.warning("Persistence queue full; writing analysis inline")
+
+    return save_analysis(result=result, explain=explain)
+
+
+def enqueue_analyses(items: Sequence[Pending]) -> None:
+    """Batch form of `enqueue_analysis`; whatever doesn't fit the queue is written in one transaction."""
+
+    overflow: List[Pending] = []
+    for i, item in enumerate(items):
+        if _queue is None:
+            overflow = list(items[i:])
+            break
+        try:
+            _queue.put_nowait(item)
+        except asyncio.QueueFull:
+            logger.warning("Persistence queue full; writing analyses inline")
+            overflow = list(items[i:])
+            break
+
+    if overflow:
+        save_analyses(overflow)
+
+
+async def _writer_loop(queue: "asyncio.Queue[Pending]") -> None:
+    while True:
+        batch = [await queue.get()]
+        while len(batch) < _WRITE_BATCH:
+            try:
+                batch.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+        try:
+            # SQLite calls block; keep them off the event loop.
+            await asyncio.to_thread(save_analyses, batch)
+        except Exception as e:
+            logger.error(f"Background persistence dropped {len(batch)} analyses: {e}")
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+
+async def start_writer() -> None:
+    """Start the background persistence writer on the running event loop."""
+
+    global _queue, _writer_task
+    if _writer_task is not None:
+        return
+    _queue = asyncio.Queue(maxsize=_QUEUE_MAXSIZE)
+    _writer_task = asyncio.create_task(_writer_loop(_queue))
+
+
+async def stop_writer() -> None:
+    """Flush pending writes and stop the background writer."""
+
+    global _queue, _writer_task
+    if _writer_task is None or _queue is None:
+        return
+
+    queue, task = _queue, _writer_task
+    # New analyses are written inline from here on.
+    _queue, _writer_task = None, None
+
+    await queue.join()
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
 def list_history(limit: int = 100) -> List[Dict[str, Any]]:
     limit = max(1, min(500, int(limit)))
 
-    with _connect() as conn:
-        rows = conn.execute(
-            """
-            SELECT a.id, a.target, a.type, a.risk_score, a.verdict, a.confidence, a.created_at, e.explain_json
-            FROM analyses a
-            LEFT JOIN analysis_explain e ON e.analysis_id = a.id
-            ORDER BY a.id DESC
-            LIMIT ?
-            """,
-            (limit,),
-        ).fetchall()
+    conn = _connection()
+    # Only signals/breakdown are returned; pull them out in SQLite's JSON1 (C) so the rest of each
+    # explain blob (scoring math, evidence) never reaches the Python decoder. json_valid keeps one
+    # malformed row from failing the whole query.
+    rows = conn.execute(
+        """
+        SELECT a.id, a.target, a.type, a.risk_score, a.verdict, a.confidence, a.created_at,
+               CASE WHEN json_valid(e.explain_json) THEN json_extract(e.explain_json, '$.signals') END
+                 AS signals_json,
+               CASE WHEN json_valid(e.explain_json) THEN json_extract(e.explain_json, '$.breakdown') END
+                 AS breakdown_json
+        FROM analyses a
+        LEFT JOIN analysis_explain e ON e.analysis_id = a.id
+        ORDER BY a.id DESC
+        LIMIT ?
+        """,
+        (limit,),
+    ).fetchall()
 
     items: List[Dict[str, Any]] = []
     for r in rows:
-        explain: Dict[str, Any] = {}
+        signals: Any = []
+        breakdown: Any = {"reputation": 0, "structure": 0, "network": 0}
         try:
-            if r["explain_json"]:
-                explain = json.loads(r["explain_json"])
+            if r["signals_json"] is not None:
+                signals = _loads(r["signals_json"])
+            if r["breakdown_json"] is not None:
+                breakdown = _loads(r["breakdown_json"])
         except Exception:
-            explain = {}
+            signals, breakdown = [], {"reputation": 0, "structure": 0, "network": 0}
 
         # Keep the original analysis response shape, with additive metadata.
         item: Dict[str, Any] = {
@@ -154,8 +312,8 @@ def list_history(limit: int = 100) -> List[Dict[str, Any]]:
             "risk_score": int(r["risk_score"]),
             "confidence": float(r["confidence"]),
             "verdict": r["verdict"],
-            "signals": explain.get("signals", []),
-            "breakdown": explain.get("breakdown", {"reputation": 0, "structure": 0, "network": 0}),
+            "signals": signals,
+            "breakdown": breakdown,
         }
         items.append(item)
 
@@ -163,23 +321,24 @@ def list_history(limit: int = 100) -> List[Dict[str, Any]]:
 
 
 def clear_history() -> None:
-    with _connect() as conn:
+    conn = _connection()
+    # Commit or roll back here: the connection outlives this call, so no transaction may leak.
+    with conn:
         conn.execute("DELETE FROM analysis_explain")
         conn.execute("DELETE FROM analyses")
-        conn.commit()
 
 
 def get_explain(analysis_id: int) -> Optional[Dict[str, Any]]:
-    with _connect() as conn:
-        r = conn.execute(
-            """
-            SELECT a.id, a.target, a.type, a.risk_score, a.verdict, a.confidence, a.created_at, e.explain_json
-            FROM analyses a
-            LEFT JOIN analysis_explain e ON e.analysis_id = a.id
-            WHERE a.id = ?
-            """,
-            (int(analysis_id),),
-        ).fetchone()
+    conn = _connection()
+    r = conn.execute(
+        """
+        SELECT a.id, a.target, a.type, a.risk_score, a.verdict, a.confidence, a.created_at, e.explain_json
+        FROM analyses a
+        LEFT JOIN analysis_explain e ON e.analysis_id = a.id
+        WHERE a.id = ?
+        """,
+        (int(analysis_id),),
+    ).fetchone()
 
     if not r:
         return None
@@ -187,7 +346,7 @@ def get_explain(analysis_id: int) -> Optional[Dict[str, Any]]:
     explain: Dict[str, Any] = {}
     try:
         if r["explain_json"]:
-            explain = json.loads(r["explain_json"])
+            explain = _loads(r["explain_json"])
     except Exception:
         explain = {}
 
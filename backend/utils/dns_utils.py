@@ -1,32 +1,73 @@
 ﻿from __future__ import annotations
 
 import asyncio
-from typing import Any, Dict, List
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import dns.asyncresolver
 import dns.resolver
 
+from backend.utils.ttl_cache import TTLCache, ttl_from_env
 
-def _resolve(domain: str, rdtype: str, lifetime: float = 2.0) -> List[str]:
+
+# Per-domain overview cache. Entries live as long as the shortest record TTL in the answer (at least
+# a minute), capped by the cache TTL: an hour, or SECURITY_ANALYZER_CACHE_TTL.
+_OVERVIEW_CACHE = TTLCache(maxsize=4096, ttl_seconds=ttl_from_env(3600))
+_MIN_TTL_SECONDS = 60.0
+
+_RECORD_TYPES = ("A", "AAAA", "NS", "MX")
+
+# Cap on DNS queries in flight per event loop, so a large batch can't flood the resolver or run out
+# of sockets. Concurrent overviews of the same domain already share one lookup (see
+# TTLCache.get_or_compute_async). Semaphores bind to a loop, hence one per running loop.
+_MAX_QUERIES_IN_FLIGHT = 64
+_QUERY_SLOTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Stats of the DNS overview cache, for the analyzer cache status endpoint."""
+    return _OVERVIEW_CACHE.stats()
+
+
+Answer = Tuple[List[str], Optional[float]]
+
+
+def _resolve(domain: str, rdtype: str, lifetime: float = 2.0) -> Answer:
+    """Return (records, rrset TTL); failures and empty answers are ([], None)."""
     try:
         answers = dns.resolver.resolve(domain, rdtype, lifetime=lifetime)
-        return [str(a).strip() for a in answers]
+        return [str(a).strip() for a in answers], float(answers.rrset.ttl)
     except Exception:
-        return []
+        return [], None
 
 
-async def _resolve_async(domain: str, rdtype: str, lifetime: float = 2.0) -> List[str]:
-    """Asynchronous DNS resolution using asyncio.to_thread."""
-    return await asyncio.to_thread(_resolve, domain, rdtype, lifetime)
+def _query_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _QUERY_SLOTS.get(loop)
+    if slots is None:
+        slots = _QUERY_SLOTS[loop] = asyncio.Semaphore(_MAX_QUERIES_IN_FLIGHT)
+    return slots
 
 
-def dns_overview(domain: str) -> Dict[str, Any]:
-    """Lightweight DNS checks used by heuristics."""
+async def _resolve_async(domain: str, rdtype: str, lifetime: float = 2.0) -> Answer:
+    """Asynchronous DNS resolution on the event loop (dnspython's native async resolver)."""
+    try:
+        async with _query_slots():
+            answers = await dns.asyncresolver.resolve(domain, rdtype, lifetime=lifetime)
+        return [str(a).strip() for a in answers], float(answers.rrset.ttl)
+    except Exception:
+        return [], None
 
-    a = _resolve(domain, "A")
-    aaaa = _resolve(domain, "AAAA")
-    ns = _resolve(domain, "NS")
-    mx = _resolve(domain, "MX")
 
+def _overview_ttl(answers: Sequence[Answer]) -> float:
+    ttls = [ttl for _, ttl in answers if ttl is not None]
+    return max(_MIN_TTL_SECONDS, min(ttls)) if ttls else _MIN_TTL_SECONDS
+
+
+def _overview(a: List[str], aaaa: List[str], ns: List[str], mx: List[str]) -> Dict[str, Any]:
     return {
         "A": a,
         "AAAA": aaaa,
@@ -38,24 +79,32 @@ def dns_overview(domain: str) -> Dict[str, Any]:
     }
 
 
+def dns_overview(domain: str) -> Dict[str, Any]:
+    """Lightweight DNS checks used by heuristics (cached per domain)."""
+
+    key = domain.lower()
+    cached = _OVERVIEW_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    # Each query can wait up to its 2s lifetime; issue all four at once so a cold lookup costs the
+    # slowest one rather than their sum.
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix="dns-overview") as pool:
+        answers = list(pool.map(lambda rdtype: _resolve(domain, rdtype), _RECORD_TYPES))
+
+    ov = _overview(*(records for records, _ in answers))
+    _OVERVIEW_CACHE.set(key, ov, _overview_ttl(answers))
+    return ov
+
+
 async def dns_overview_async(domain: str) -> Dict[str, Any]:
     """Asynchronous version of dns_overview running resolutions in parallel."""
 
-    tasks = [
-        _resolve_async(domain, "A"),
-        _resolve_async(domain, "AAAA"),
-        _resolve_async(domain, "NS"),
-        _resolve_async(domain, "MX"),
-    ]
+    ttl: List[float] = []
 
-    a, aaaa, ns, mx = await asyncio.gather(*tasks)
+    async def compute() -> Dict[str, Any]:
+        answers = await asyncio.gather(*(_resolve_async(domain, rdtype) for rdtype in _RECORD_TYPES))
+        ttl.append(_overview_ttl(answers))
+        return _overview(*(records for records, _ in answers))
 
-    return {
-        "A": a,
-        "AAAA": aaaa,
-        "NS": ns,
-        "MX": mx,
-        "has_a_or_aaaa": bool(a or aaaa),
-        "has_ns": bool(ns),
-        "has_mx": bool(mx),
-    }
+    return await _OVERVIEW_CACHE.get_or_compute_async(domain.lower(), compute, ttl_for=lambda _: ttl[0])
@@ -3,9 +3,17 @@
 import hashlib
 import json
 import logging
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
+
+# Pure; the same target is usually logged more than once (failures, completion, retries).
+@lru_cache(maxsize=4096)
 def target_fingerprint(target: str) -> str:
     """Return a stable, non-reversible fingerprint for logging.
 
@@ -42,4 +50,8 @@ def log_analysis_event(
     }
 
     # Emit as a JSON string to keep it structured even with default logging formatters.
-    logger.info(json.dumps(payload, separators=(",", ":")))
+    # orjson's output is already compact, matching the stdlib separators below.
+    if orjson is not None:
+        logger.info(orjson.dumps(payload).decode())
+    else:
+        logger.info(json.dumps(payload, separators=(",", ":")))
@@ -1,19 +1,90 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import mmap
 import os
 import time
-import requests
-import zipfile
-import io
-from typing import Set, Optional, Dict, Any
+import tempfile
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Iterable, List, Optional, Dict, Any, Sequence, TextIO
 from urllib.parse import urlparse
 
 logger = logging.getLogger("security_analyzer")
 
+try:
+    import tldextract
+except ImportError:  # pragma: no cover
+    tldextract = None
+
+# One extractor for the process, working from the suffix list bundled with tldextract: no fetch from
+# publicsuffix.org (or cache-dir I/O) the first time a domain is normalized.
+_TLD_EXTRACT = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None) if tldextract is not None else None
+
+
+# Pure string work (tldextract's suffix list is fixed once loaded), so safe to memoize; each
+# analysis asks about the same host several times and batches repeat hosts.
+@lru_cache(maxsize=8192)
+def _normalize_domain(domain: str) -> str:
+    d = domain.lower().strip().rstrip(".")
+    
+    # Strip protocol if present
+    if "://" in d:
+        try:
+            parsed = urlparse(d)
+            d = parsed.hostname or d
+        except Exception:
+            pass
+    
+    # Remove trailing slash/path if still present
+    if "/" in d:
+        d = d.partition("/")[0]
+
+    # Strip www.
+    if d.startswith("www."):
+        d = d[4:]
+
+    # Extract base domain using tldextract if available
+    if _TLD_EXTRACT is not None:
+        ext = _TLD_EXTRACT(d)
+        # tldextract >= 5.3 renamed registered_domain (the old name now warns on every access).
+        registered = getattr(ext, "top_domain_under_public_suffix", None)
+        if registered is None:
+            registered = ext.registered_domain
+        if registered:
+            return registered
+    else:
+        # Fallback: very basic SLD+TLD extraction for common cases
+        parts = d.split(".")
+        if len(parts) >= 2:
+            return ".".join(parts[-2:])
+
+    return d
+
+
+def _domain_hash(domain: str) -> int:
+    # 64-bit digest; across ~100K domains a false match is ~1e-10 likely.
+    return int.from_bytes(hashlib.blake2b(domain.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _write_domains(lines: Iterable[str], out: TextIO) -> int:
+    """Copy the domain column of Tranco "rank,domain" CSV lines to `out`; returns how many."""
+    count = 0
+    for line in lines:
+        _, sep, rest = line.strip().partition(',')
+        if sep:
+            out.write(rest.partition(',')[0] + "\n")
+            count += 1
+    return count
+
+
 class ReputationService:
     _instance: Optional[ReputationService] = None
-    _top_domains: Set[str] = set()
+    # Sorted 64-bit digests of the top domains rather than the strings themselves: ~0.8 MB in one
+    # contiguous buffer instead of ~10 MB of str objects plus set slots.
+    _top_hashes: Sequence[int] = array("Q")
     _status: Dict[str, Any] = {
         "loaded": False,
         "count": 0,
@@ -43,17 +114,53 @@ class ReputationService:
                 return
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                self._top_domains = {line.strip().lower() for line in f if line.strip()}
+            # Built fully, then swapped in with one assignment, so concurrent lookups never see a
+            # half-loaded table.
+            self._top_hashes = self._load_hashes(file_path)
             
             self._status["loaded"] = True
-            self._status["count"] = len(self._top_domains)
+            self._status["count"] = len(self._top_hashes)
             self._status["last_sync"] = time.ctime(os.path.getmtime(file_path))
             
-            logger.info(f"Loaded {len(self._top_domains)} domains into Reputation Service.")
+            logger.info(f"Loaded {len(self._top_hashes)} domains into Reputation Service.")
         except Exception as e:
             logger.error(f"Failed to load reputation dataset: {e}")
 
+    def _load_hashes(self, file_path: str) -> Sequence[int]:
+        """Sorted digests for the dataset, reusing the `.u64` sidecar left by an earlier load.
+
+        The sidecar is a raw dump of the array behind a header recording the text file's size and
+        mtime (ns). When both match exactly it is mapped read-only and searched in place: no parsing
+        or hashing on start, and worker processes share the same page-cache pages. Otherwise it is
+        rebuilt (e.g. after a Tranco sync, or a copy that preserved an older mtime).
+        """
+        sidecar = file_path + ".u64"
+        st = os.stat(file_path)
+        header = array("Q", (st.st_size, st.st_mtime_ns))
+        header_len = len(header) * header.itemsize
+        try:
+            with open(sidecar, "rb") as f:
+                if f.read(header_len) == header.tobytes() and os.fstat(f.fileno()).st_size > header_len:
+                    # The mapping outlives the file handle; replacing the sidecar later makes a new
+                    # inode, so an existing mapping keeps its old contents.
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    return memoryview(mm)[header_len:].cast("Q")
+        except (OSError, ValueError, TypeError):
+            pass
+
+        with open(file_path, "r", encoding="utf-8") as f:
+            hashes = array("Q", sorted({_domain_hash(line.strip().lower()) for line in f if line.strip()}))
+
+        try:
+            tmp = sidecar + ".tmp"
+            with open(tmp, "wb") as out:
+                header.tofile(out)
+                hashes.tofile(out)
+            os.replace(tmp, sidecar)
+        except OSError as e:
+            logger.warning(f"Could not write reputation digest cache {sidecar}: {e}")
+        return hashes
+
     def _check_and_sync(self, file_path: str):
         """Check if dataset is missing or older than 7 days, and sync if needed."""
         needs_sync = False
@@ -71,45 +178,61 @@ class ReputationService:
             self._sync_from_tranco(file_path)
 
     def _sync_from_tranco(self, output_path: str):
-        """Download and extract the latest Tranco 100K list."""
+        """Download and extract the latest Tranco 100K list.
+
+        The body is streamed to a temporary file and the domains are written out line by line, so
+        neither the archive nor the decoded list is ever held in memory whole.
+        """
+        # Only needed for the (rare) dataset refresh, so kept out of module import.
+        import io
+        import zipfile
+
+        import requests
+
         url = self._status["source"]
+        tmp_path = output_path + ".tmp"
         try:
             logger.info(f"Downloading latest Tranco list from {url}...")
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
+            with requests.get(url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type', '')
 
-            # Tranco current/100000 returns a CSV inside a ZIP or a direct CSV
-            # Their API has changed occasionally, so we handle both.
-            content_type = response.headers.get('Content-Type', '')
-            
-            domains = []
-            if 'zip' in content_type or response.content[:2] == b'PK':
-                with zipfile.ZipFile(io.BytesIO(response.content)) as z:
-                    for filename in z.namelist():
-                        if filename.endswith('.csv'):
-                            with z.open(filename) as f:
-                                # CSV format is "rank,domain"
-                                for line in f:
-                                    parts = line.decode('utf-8').strip().split(',')
-                                    if len(parts) >= 2:
-                                        domains.append(parts[1])
-            else:
-                # Assume direct CSV
-                for line in response.text.splitlines():
-                    parts = line.strip().split(',')
-                    if len(parts) >= 2:
-                        domains.append(parts[1])
-
-            if domains:
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                with open(output_path, "w", encoding="utf-8") as f:
-                    f.write("\n".join(domains))
-                logger.info(f"Successfully synced {len(domains)} domains to {output_path}")
+                with tempfile.TemporaryFile() as body:
+                    for chunk in response.iter_content(chunk_size=65536):
+                        body.write(chunk)
+                    body.seek(0)
+                    is_zip = body.read(2) == b'PK'
+                    body.seek(0)
+
+                    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+                    with open(tmp_path, "w", encoding="utf-8") as out:
+                        # Tranco current/100000 returns a CSV inside a ZIP or a direct CSV
+                        # Their API has changed occasionally, so we handle both.
+                        if 'zip' in content_type or is_zip:
+                            count = 0
+                            with zipfile.ZipFile(body) as z:
+                                for filename in z.namelist():
+                                    if filename.endswith('.csv'):
+                                        with z.open(filename) as f:
+                                            count += _write_domains(io.TextIOWrapper(f, encoding='utf-8'), out)
+                        else:
+                            # Assume direct CSV
+                            count = _write_domains(io.TextIOWrapper(body, encoding='utf-8'), out)
+
+            if count:
+                os.replace(tmp_path, output_path)
+                logger.info(f"Successfully synced {count} domains to {output_path}")
             else:
+                os.remove(tmp_path)
                 logger.error("Sync failed: No domains found in response.")
 
         except Exception as e:
             logger.error(f"Failed to sync reputation dataset from Tranco: {e}")
+            # Don't leave a partial download behind.
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
 
     def normalize_domain(self, domain: str) -> str:
         """
@@ -119,40 +242,28 @@ class ReputationService:
         - Strip www.
         - Extract registered domain (base domain)
         """
-        d = domain.lower().strip().rstrip(".")
-        
-        # Strip protocol if present
-        if "://" in d:
-            try:
-                parsed = urlparse(d)
-                d = parsed.hostname or d
-            except Exception:
-                pass
-        
-        # Remove trailing slash/path if still present
-        if "/" in d:
-            d = d.split("/")[0]
-
-        # Strip www.
-        if d.startswith("www."):
-            d = d[4:]
-
-        # Extract base domain using tldextract if available
-        try:
-            import tldextract
-            ext = tldextract.extract(d)
-            if ext.registered_domain:
-                return ext.registered_domain
-        except ImportError:
-            # Fallback: very basic SLD+TLD extraction for common cases
-            parts = d.split(".")
-            if len(parts) >= 2:
-                return ".".join(parts[-2:])
-
-        return d
+        return _normalize_domain(domain)
 
     def is_reputable(self, target: str) -> bool:
-        normalized = self.normalize_domain(target)
-        return normalized in self._top_domains
+        hashes = self._top_hashes
+        if not hashes:
+            return False
+        h = _domain_hash(self.normalize_domain(target))
+        i = bisect_left(hashes, h)
+        return i < len(hashes) and hashes[i] == h
+
+    def are_reputable(self, targets: Iterable[str]) -> List[bool]:
+        """`is_reputable` for many targets (e.g. every link on a page), with lookups hoisted out of the loop."""
+        hashes = self._top_hashes
+        if not hashes:
+            return [False for _ in targets]
+        normalize, digest, find, n = _normalize_domain, _domain_hash, bisect_left, len(hashes)
+        out: List[bool] = []
+        append = out.append
+        for target in targets:
+            h = digest(normalize(target))
+            i = find(hashes, h)
+            append(i < n and hashes[i] == h)
+        return out
 
 reputation_service = ReputationService()
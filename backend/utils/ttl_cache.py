@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+_MISSING = object()
+
+
+def ttl_from_env(default_seconds: float) -> float:
+    """Resolve a cache TTL, honoring the global override.
+
+    Tunable via env var:
+      SECURITY_ANALYZER_CACHE_TTL=<seconds>   (0 disables caching)
+    """
+
+    raw = os.environ.get("SECURITY_ANALYZER_CACHE_TTL")
+    if raw is None or not raw.strip():
+        return float(default_seconds)
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return float(default_seconds)
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL.
+
+    Entries are stored as `(expiry_monotonic, value)`; expired entries are dropped lazily on access.
+    A TTL of 0 disables caching (every lookup is a miss).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 600.0) -> None:
+        self.maxsize = max(1, int(maxsize))
+        self.ttl_seconds = float(ttl_seconds)
+        self.hits = 0
+        self.misses = 0
+
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # key -> [asyncio.Lock, waiter_count]; used to collapse concurrent misses.
+        self._inflight: Dict[Hashable, List[Any]] = {}
+
+    def _lookup(self, key: Hashable, count: bool = True) -> Any:
+        """Return the live value for `key` or `_MISSING`; `count` records the hit/miss in stats."""
+
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._data[key]
+                entry = None
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return _MISSING
+            self._data.move_to_end(key)
+            if count:
+                self.hits += 1
+            return entry[1]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store `value`; `ttl_seconds` overrides the cache TTL for this entry (never extending it)."""
+
+        if self.ttl_seconds <= 0:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    async def get_or_compute_async(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        cache_if: Optional[Callable[[Any], bool]] = None,
+        ttl_for: Optional[Callable[[Any], Optional[float]]] = None,
+    ) -> Any:
+        """Return the cached value for `key`, or await `compute()` and cache it.
+
+        Concurrent misses for the same key wait on a per-key lock, so only one computation runs
+        (singleflight); the others pick up its result from the cache. Results rejected by
+        `cache_if` are returned but not stored; `ttl_for` picks a per-entry TTL (see `set`).
+        """
+
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        slot = self._inflight.get(key)
+        if slot is None:
+            slot = self._inflight[key] = [asyncio.Lock(), 0]
+        slot[1] += 1
+
+        try:
+            async with slot[0]:
+                # Re-check after waiting; the get() above already counted this lookup.
+                value = self._lookup(key, count=False)
+                if value is _MISSING:
+                    value = await compute()
+                    if cache_if is None or cache_if(value):
+                        self.set(key, value, ttl_for(value) if ttl_for is not None else None)
+                return value
+        finally:
+            slot[1] -= 1
+            if slot[1] == 0:
+                self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -2,8 +2,9 @@
 
 import ipaddress
 import re
-from typing import Literal, Tuple
-from urllib.parse import urlparse
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Literal, Optional, Tuple
 
 TargetType = Literal["domain", "url", "ip"]
 
@@ -13,8 +14,53 @@ _DOMAIN_RE = re.compile(
     r"(\.(?!-)[A-Za-z0-9-]{1,63}(?<!-))+$"
 )
 
+# Shape of an IPv4/IPv6 literal (a superset of what ipaddress accepts). Anything that doesn't match
+# can't be an IP, so the common domain/URL case never reaches ipaddress's raise-on-failure parsing.
+_IP_SHAPE_RE = re.compile(
+    r"(?:\d{1,3}(?:\.\d{1,3}){3}|(?=[0-9A-Fa-f.]*:)[0-9A-Fa-f:.]+(?:%.+)?)\Z",
+    re.ASCII | re.DOTALL,
+)
+
+# RFC 3986 component split (scheme, authority, path, query, fragment) in one match.
+# Every group is optional, so the pattern matches any string.
+_URL_RE = re.compile(
+    r"^(?:(?P<scheme>[A-Za-z][A-Za-z0-9+\-.]*):)?"
+    r"(?://(?P<netloc>[^/?#]*))?"
+    r"(?P<path>[^?#]*)"
+    r"(?:\?(?P<query>[^#]*))?"
+    r"(?:#(?P<fragment>.*))?$",
+    re.DOTALL,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedTarget:
+    """A URL parsed once and shared by the URL, IP and domain heuristics."""
+
+    url: str  # normalized input (scheme added if missing)
+    scheme: str  # lowercased
+    netloc: str
+    host: str  # lowercased, userinfo/port removed, IPv6 brackets stripped
+    path: str
+    query: str
+    fragment: str
+    host_is_ip: bool
+    host_ascii: str  # IDNA (punycode) form of `host` for domain heuristics
+
+
+@dataclass(frozen=True, slots=True)
+class ResolvedTarget:
+    """A request target with its type decided and its analyzer/cache forms computed once."""
+
+    raw: str  # stripped user input
+    type: TargetType
+    value: str  # what the analyzer is called with
+    key: str  # normalized form the analyzers cache on
+
 
 def is_ip(value: str) -> bool:
+    if not _IP_SHAPE_RE.match(value):
+        return False
     try:
         ipaddress.ip_address(value)
         return True
@@ -28,6 +74,9 @@ def normalize_ip(value: str) -> str:
 
 def normalize_domain(value: str) -> str:
     d = value.strip().lower().rstrip(".")
+    # The IDNA codec returns ASCII input unchanged (or fails and we keep it anyway), so skip it.
+    if d.isascii():
+        return d
     # Convert Unicode domains to IDNA (punycode) for consistent analysis.
     try:
         d = d.encode("idna").decode("ascii")
@@ -55,14 +104,40 @@ def normalize_url(value: str) -> str:
     return v
 
 
-from urllib.parse import urlparse, ParseResult
+def _hostname_from_netloc(netloc: str) -> str:
+    host = netloc.rpartition("@")[2]
+    if host.startswith("["):
+        # IPv6 literal: [addr]:port
+        end = host.find("]")
+        host = host[1:end] if end != -1 else host[1:]
+    else:
+        host = host.partition(":")[0]
+    return host.lower()
 
-def parse_url_loose(value: str) -> Tuple[str, ParseResult]:
+
+# ParsedTarget is frozen, so one instance can be shared by every caller parsing the same URL.
+@lru_cache(maxsize=2048)
+def parse_url_loose(value: str) -> ParsedTarget:
     u = normalize_url(value)
-    p = urlparse(u)
-    if not p.netloc:
+    m = _URL_RE.match(u)
+    netloc = (m.group("netloc") or "") if m else ""
+    if not netloc:
         raise ValueError("Invalid URL: missing host")
-    return u, p
+
+    host = _hostname_from_netloc(netloc)
+    host_is_ip = bool(host) and is_ip(host)
+
+    return ParsedTarget(
+        url=u,
+        scheme=(m.group("scheme") or "").lower(),
+        netloc=netloc,
+        host=host,
+        path=m.group("path") or "",
+        query=m.group("query") or "",
+        fragment=m.group("fragment") or "",
+        host_is_ip=host_is_ip,
+        host_ascii=host if host_is_ip else normalize_domain(host),
+    )
 
 
 def detect_target_type(value: str) -> Tuple[TargetType, str]:
@@ -81,3 +156,26 @@ def detect_target_type(value: str) -> Tuple[TargetType, str]:
         return "domain", d
 
     raise ValueError("Target is not a valid domain, URL, or IP address")
+
+
+_NORMALIZERS: Dict[str, Callable[[str], str]] = {
+    "url": normalize_url,
+    "ip": normalize_ip,
+    "domain": normalize_domain,
+}
+
+
+def resolve_target(value: str, target_type: Optional[TargetType] = None) -> ResolvedTarget:
+    """Decide a target's type (unless given) and compute its analyzer input and cache key."""
+
+    raw = value.strip()
+    if not raw:
+        raise ValueError("Missing target")
+
+    if target_type:
+        kind, arg = target_type, raw
+    else:
+        kind, normalized = detect_target_type(raw)
+        arg = raw if kind == "url" else normalized
+
+    return ResolvedTarget(raw=raw, type=kind, value=arg, key=_NORMALIZERS[kind](arg))
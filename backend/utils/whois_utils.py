@@ -1,10 +1,37 @@
 ﻿from __future__ import annotations
 
 import asyncio
+import logging
+import re
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Dict, Optional, Tuple
 
-import whois
+from backend.persistence.lookup_cache import lookup_cache
+from backend.utils.ttl_cache import TTLCache, ttl_from_env
+
+
+logger = logging.getLogger("security_analyzer")
+
+# Creation date/registrar rarely change, but a dropped-and-re-registered domain must not keep its
+# old age forever; a day bounds that. Failed lookups aren't cached so they are retried.
+_WHOIS_CACHE = TTLCache(maxsize=4096, ttl_seconds=ttl_from_env(86400))
+# Same bound on disk, so a restart doesn't re-query every domain seen in the last day.
+_WHOIS_DISK = lookup_cache("whois", 86400)
+
+
+_WHOIS_PORT = 43
+_WHOIS_TIMEOUT = 10.0  # python-whois's default socket timeout
+_IANA_HOST = "whois.iana.org"
+_IANA_WHOIS_RE = re.compile(r"whois:[ \t]+(.*?)\n")
+
+# TLD -> WHOIS server as published by IANA, for TLDs python-whois has no built-in server for.
+_IANA_SERVERS: Dict[str, Optional[str]] = {}
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Stats of the in-memory WHOIS cache, for the analyzer cache status endpoint."""
+    return _WHOIS_CACHE.stats()
 
 
 def _pick_earliest_date(value: Any) -> Optional[datetime]:
@@ -18,17 +45,67 @@ def _pick_earliest_date(value: Any) -> Optional[datetime]:
     return None
 
 
+def _whois_ok(summary: Dict[str, Any]) -> bool:
+    return bool(summary.get("ok"))
+
+
+def _disk_get(key: str) -> Optional[Dict[str, Any]]:
+    raw = _WHOIS_DISK.get(key)
+    if raw is None:
+        return None
+    creation = raw.get("creation_date")
+    try:
+        creation = datetime.fromisoformat(creation) if creation else None
+    except (TypeError, ValueError):
+        creation = None
+    return {"ok": True, "creation_date": creation, "registrar": raw.get("registrar")}
+
+
+def _disk_set(key: str, summary: Dict[str, Any]) -> None:
+    creation = summary.get("creation_date")
+    _WHOIS_DISK.set(
+        key,
+        {
+            "creation_date": creation.isoformat() if isinstance(creation, datetime) else None,
+            "registrar": summary.get("registrar"),
+        },
+    )
+
+
 def whois_summary(domain: str) -> Dict[str, Any]:
-    """Best-effort WHOIS lookup.
+    """Best-effort WHOIS lookup (cached per domain, in memory and on disk).
 
     WHOIS is inconsistent across TLDs/registrars; this must be resilient.
     """
 
+    key = domain.lower()
+    cached = _WHOIS_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    summary = _disk_get(key)
+    if summary is None:
+        summary = _whois_lookup(domain)
+        if _whois_ok(summary):
+            _disk_set(key, summary)
+    if _whois_ok(summary):
+        _WHOIS_CACHE.set(key, summary)
+    return summary
+
+
+def _whois_lookup(domain: str) -> Dict[str, Any]:
+    # python-whois pulls in a few dozen modules; import it on the first real lookup, so cache hits
+    # (and processes that never look up a domain) don't pay for it.
+    import whois
+
     try:
         w = whois.whois(domain)
     except Exception as e:
         return {"ok": False, "error": str(e)}
+    return _summarize(w)
+
 
+def _summarize(w: Any) -> Dict[str, Any]:
     creation = _pick_earliest_date(getattr(w, "creation_date", None) or w.get("creation_date"))
     registrar = getattr(w, "registrar", None) or w.get("registrar")
 
@@ -39,9 +116,159 @@ def whois_summary(domain: str) -> Dict[str, Any]:
     }
 
 
+@lru_cache(maxsize=None)
+def _async_client_supported() -> bool:
+    """Whether the python-whois internals the async client mirrors are all present.
+
+    The async path reuses NICClient's server selection and parsing but does its own socket I/O; if
+    a python-whois release moves any of those pieces, lookups go through `_whois_lookup` on a
+    thread instead of silently failing.
+    """
+
+    try:
+        import whois
+        from whois.parser import WhoisEntry
+        from whois.whois import NICClient
+    except ImportError:
+        return False
+
+    ok = (
+        all(hasattr(whois, name) for name in ("IPV4_OR_V6", "extract_domain"))
+        and hasattr(WhoisEntry, "load")
+        and all(
+            hasattr(NICClient, name)
+            for name in (
+                "choose_server",
+                "findwhois_iana",
+                "findwhois_server",
+                "DENICHOST",
+                "DK_HOST",
+                "QNICHOST_TAIL",
+            )
+        )
+    )
+    if not ok:
+        logger.warning("Unsupported python-whois version; async WHOIS lookups will use worker threads.")
+    return ok
+
+
+class _IanaMiss(Exception):
+    def __init__(self, tld: str) -> None:
+        super().__init__(tld)
+        self.tld = tld
+
+
+@lru_cache(maxsize=None)
+def _nic() -> Any:
+    """The shared python-whois client, built (and python-whois imported) on first use."""
+
+    from whois.whois import NICClient
+
+    class _NICClient(NICClient):
+        # python-whois asks whois.iana.org over a blocking socket, on every lookup, for TLDs it has
+        # no built-in server for (.com included). Answer from the cache; the async caller fills it.
+        def findwhois_iana(self, tld: str) -> Optional[str]:
+            try:
+                return _IANA_SERVERS[tld]
+            except KeyError:
+                raise _IanaMiss(tld) from None
+
+    return _NICClient()
+
+
+def _format_query(query: str, host: str, many_results: bool) -> str:
+    # Same per-registry query quirks as NICClient.whois.
+    nic = _nic()
+    if host == nic.DENICHOST:
+        return "-T dn,ace -C UTF-8 " + query
+    if host == nic.DK_HOST:
+        return " --show-handles " + query
+    if host.endswith(".jp"):
+        return query + "/e"
+    if host.endswith(nic.QNICHOST_TAIL) and many_results:
+        return "=" + query
+    return query
+
+
+async def _whois_query(query: str, host: str, many_results: bool = False) -> str:
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, _WHOIS_PORT), _WHOIS_TIMEOUT)
+    try:
+        writer.write(_format_query(query, host, many_results).encode("utf-8") + b"\r\n")
+        await writer.drain()
+        data = await asyncio.wait_for(reader.read(), _WHOIS_TIMEOUT)
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+    return data.decode("utf-8", "replace")
+
+
+async def _whois_server(domain: str) -> Optional[str]:
+    try:
+        return _nic().choose_server(domain)
+    except _IanaMiss as miss:
+        match = _IANA_WHOIS_RE.search(await _whois_query(miss.tld, _IANA_HOST))
+        _IANA_SERVERS[miss.tld] = match.group(1) if match and match.group(1) else None
+        return _nic().choose_server(domain)
+
+
+async def _whois_text(query: str, host: str, recurse: bool = True, many_results: bool = False) -> str:
+    """NICClient.whois on asyncio streams: one registry query plus the registrar referral."""
+
+    text = await _whois_query(query, host, many_results)
+    if 'with "=xxx"' in text and not many_results:
+        return await _whois_text(query, host, recurse, many_results=True)
+    if recurse:
+        referral = _nic().findwhois_server(text, host, query)
+        if referral:
+            try:
+                text += await _whois_text(query, referral, recurse=False)
+            except (OSError, asyncio.TimeoutError):
+                pass  # the registry's answer alone still carries the creation date and registrar
+    return text
+
+
+async def _whois_lookup_async(domain: str) -> Dict[str, Any]:
+    """`_whois_lookup` without a thread: the WHOIS exchanges run on the event loop."""
+
+    if not _async_client_supported():
+        return await asyncio.to_thread(_whois_lookup, domain)
+
+    import whois
+    from whois.parser import WhoisEntry
+
+    if whois.IPV4_OR_V6.match(domain):
+        # python-whois reverse-resolves IPs first (blocking); keep that rare case on a thread.
+        return await asyncio.to_thread(_whois_lookup, domain)
+
+    try:
+        name = whois.extract_domain(domain).encode("idna").decode("utf-8")
+        server = await _whois_server(name)
+        text = await _whois_text(name, server) if server else ""
+        if not text:
+            raise ValueError("Whois command returned no output")
+        w = WhoisEntry.load(name, text)
+    except Exception as e:
+        return {"ok": False, "error": str(e) or type(e).__name__}
+    return _summarize(w)
+
+
 async def whois_summary_async(domain: str) -> Dict[str, Any]:
-    """Asynchronous version of whois_summary using asyncio.to_thread."""
-    return await asyncio.to_thread(whois_summary, domain)
+    """Asynchronous version of whois_summary; lookups use asyncio sockets, not worker threads."""
+
+    key = domain.lower()
+
+    async def compute() -> Dict[str, Any]:
+        summary = _disk_get(key)
+        if summary is None:
+            summary = await _whois_lookup_async(domain)
+            if _whois_ok(summary):
+                _disk_set(key, summary)
+        return summary
+
+    return await _WHOIS_CACHE.get_or_compute_async(key, compute, cache_if=_whois_ok)
 
 
 def domain_age_days(domain: str) -> Tuple[Optional[int], Dict[str, Any]]:
@@ -19,10 +19,12 @@ from backend.heuristics.domain_heuristics import (
     suspicious_tld_signal
 )
 from backend.heuristics.url_heuristics import (
+    UrlInput,
     homograph_signal,
     shortener_signal,
     length_entropy_signal
 )
+from backend.utils.validators import ParsedTarget, parse_url_loose
 
 # Re-export or map legacy functions
 
@@ -33,39 +35,42 @@ def domain_reputation_signal(domain: str) -> List[Dict[str, Any]]:
     
     tld_sig = suspicious_tld_signal(domain)
     if tld_sig:
-        signals.append(tld_sig)
+        signals.append(tld_sig.to_dict())
         
     reg_sig = registrar_reputation_signal(domain)
     if reg_sig:
-        signals.append(reg_sig)
+        signals.append(reg_sig.to_dict())
         
     return signals
 
 def domain_age_signal(domain: str) -> List[Dict[str, Any]]:
     """Legacy wrapper for domain age."""
-    # New implementation returns a single Dict, old returned List[Dict]
+    # New implementation returns a single Signal, old returned List[Dict]
     sig = _new_domain_age(domain)
-    return [sig] if sig else []
+    return [sig.to_dict()] if sig else []
 
-def url_structure_signal(url: str) -> List[Dict[str, Any]]:
+def url_structure_signal(url: UrlInput) -> List[Dict[str, Any]]:
     """Legacy wrapper for URL structure."""
     # Map to length/entropy signals
     sig = length_entropy_signal(url)
-    return [sig] if sig else []
+    return [sig.to_dict()] if sig else []
 
-def obfuscation_signal(url: str) -> List[Dict[str, Any]]:
+def obfuscation_signal(url: UrlInput) -> List[Dict[str, Any]]:
     """Legacy wrapper for obfuscation detection."""
     signals = []
-    
+
+    # Parse once; both checks below read the same ParsedTarget.
+    parsed = url if isinstance(url, ParsedTarget) else parse_url_loose(url)
+
     # Check for homographs/IDN
-    homo = homograph_signal(url)
+    homo = homograph_signal(parsed)
     if homo and homo.get("impact", 0) > 0:
-        signals.append(homo)
+        signals.append(homo.to_dict())
         
     # Check for shorteners (often used to obfuscate)
-    short = shortener_signal(url)
+    short = shortener_signal(parsed)
     if short and short.get("impact", 0) > 0:
-        signals.append(short)
+        signals.append(short.to_dict())
         
     return signals
 
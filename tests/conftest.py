@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_lookup_cache(tmp_path, monkeypatch):
+    # RDAP/rDNS/WHOIS results are persisted; keep them out of backend/data during tests.
+    monkeypatch.setenv("SECURITY_ANALYZER_LOOKUP_CACHE_PATH", str(tmp_path / "lookups.sqlite3"))
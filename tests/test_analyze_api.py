@@ -0,0 +1,80 @@
+import asyncio
+
+import backend.api.analyze as analyze_api
+from backend.utils.validators import resolve_target
+
+
+def test_concurrent_identical_targets_share_one_analysis(monkeypatch):
+    calls = []
+
+    async def fake_domain(domain):
+        calls.append(domain)
+        await asyncio.sleep(0.01)
+        return {"target": domain, "risk_score": 1}, {"target": domain}
+
+    monkeypatch.setitem(analyze_api._ANALYZERS_ASYNC, "domain", fake_domain)
+
+    async def run():
+        return await asyncio.gather(
+            analyze_api._analyze_shared(resolve_target("example.com", "domain")),
+            analyze_api._analyze_shared(resolve_target("EXAMPLE.com.", "domain")),
+            analyze_api._analyze_shared(resolve_target("example.com", "domain")),
+        )
+
+    results = asyncio.run(run())
+
+    assert calls == ["example.com"]
+    assert [r[0]["target"] for r in results] == ["example.com", "EXAMPLE.com.", "example.com"]
+    assert analyze_api._INFLIGHT == {}
+
+
+def test_batch_keeps_input_order_and_isolates_failures(tmp_path, monkeypatch):
+    monkeypatch.setenv("SECURITY_ANALYZER_DB_PATH", str(tmp_path / "test.sqlite3"))
+    from backend.persistence.sqlite_store import init_db, list_history
+
+    init_db()
+
+    async def fake_domain(domain):
+        await asyncio.sleep(0.001)
+        return {"target": domain, "type": "domain", "risk_score": 5, "verdict": "SAFE", "confidence": 0.5}, {}
+
+    monkeypatch.setitem(analyze_api._ANALYZERS_ASYNC, "domain", fake_domain)
+
+    req = analyze_api.BatchAnalyzeRequest(targets=["b.com", "not a target", "a.com"], parallel=2)
+    results = asyncio.run(analyze_api.analyze_batch(req))
+
+    assert [r["target"] for r in results] == ["b.com", "not a target", "a.com"]
+    assert "error" in results[1]
+    assert sorted(h["target"] for h in list_history(limit=10)) == ["a.com", "b.com"]
+
+
+def test_cache_status_reports_current_caches(monkeypatch):
+    from backend.utils import dns_utils
+    from backend.utils.ttl_cache import TTLCache
+
+    monkeypatch.setattr(dns_utils, "_OVERVIEW_CACHE", TTLCache(maxsize=7, ttl_seconds=60))
+    assert analyze_api.analyzer_cache_status()["dns"]["maxsize"] == 7
+
+
+def test_partial_url_analysis_is_not_cached(monkeypatch):
+    from backend.analyzers import url as url_analyzer
+    from backend.utils.ttl_cache import TTLCache
+
+    async def failing_host(domain):
+        raise RuntimeError("dns down")
+
+    async def no_url_signals(parsed):
+        return []
+
+    monkeypatch.setattr(url_analyzer, "URL_CACHE", TTLCache(maxsize=8, ttl_seconds=60))
+    monkeypatch.setattr(url_analyzer, "url_signals_async", no_url_signals)
+    monkeypatch.setattr(url_analyzer, "domain_signals_async", failing_host)
+
+    result, _ = asyncio.run(url_analyzer.analyze_url_explain_async("https://example.com/login"))
+
+    assert result["target"] == "https://example.com/login"
+    assert len(url_analyzer.URL_CACHE) == 0
+
+    monkeypatch.setattr(url_analyzer, "domain_signals_async", no_url_signals)
+    asyncio.run(url_analyzer.analyze_url_explain_async("https://example.com/login"))
+    assert len(url_analyzer.URL_CACHE) == 1
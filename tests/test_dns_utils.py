@@ -0,0 +1,50 @@
+import asyncio
+
+from backend.utils import dns_utils
+from backend.utils.ttl_cache import TTLCache
+
+
+def test_dns_overview_expires_with_record_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("backend.utils.ttl_cache.time.monotonic", lambda: now[0])
+    monkeypatch.setattr(dns_utils, "_OVERVIEW_CACHE", TTLCache(maxsize=4, ttl_seconds=3600))
+
+    calls = []
+
+    def fake_resolve(domain, rdtype, lifetime=2.0):
+        calls.append(rdtype)
+        return ([f"{rdtype}-record"], 300.0 if rdtype == "A" else 900.0) if rdtype != "MX" else ([], None)
+
+    monkeypatch.setattr(dns_utils, "_resolve", fake_resolve)
+
+    assert dns_utils.dns_overview("example.com")["A"] == ["A-record"]
+    now[0] += 299
+    dns_utils.dns_overview("example.com")
+    assert len(calls) == 4
+
+    # The shortest record TTL (A, 300s) bounds the cached overview.
+    now[0] += 2
+    dns_utils.dns_overview("example.com")
+    assert len(calls) == 8
+
+
+def test_async_dns_queries_are_bounded(monkeypatch):
+    monkeypatch.setattr(dns_utils, "_OVERVIEW_CACHE", TTLCache(maxsize=64, ttl_seconds=60))
+    monkeypatch.setattr(dns_utils, "_MAX_QUERIES_IN_FLIGHT", 3)
+
+    active, peak = [0], [0]
+
+    async def fake_resolve(domain, rdtype, lifetime=2.0):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.001)
+        active[0] -= 1
+        raise dns_utils.dns.resolver.NXDOMAIN()
+
+    monkeypatch.setattr(dns_utils.dns.asyncresolver, "resolve", fake_resolve)
+
+    async def run():
+        await asyncio.gather(*(dns_utils.dns_overview_async(f"d{i}.example") for i in range(10)))
+
+    asyncio.run(run())
+    assert peak[0] == 3
@@ -1,4 +1,6 @@
-﻿from backend.heuristics.domain_heuristics import domain_signals
+﻿import os
+
+from backend.heuristics.domain_heuristics import domain_signals
 
 
 def test_domain_signals_are_stable(monkeypatch):
@@ -30,3 +32,100 @@ def test_domain_age_bucket_present(monkeypatch):
     sigs = domain_signals("example.com")
     age = next(s for s in sigs if s["name"] == "Domain Age")
     assert "age_bucket" in age.get("evidence", {})
+
+
+def test_homoglyph_lookalike_maps_to_brand():
+    from backend.heuristics.domain_heuristics import homoglyph_attack_signal
+
+    sig = homoglyph_attack_signal("paypa1.com")
+    assert sig is not None
+    assert sig["evidence"]["lookalike_of"] == "paypal"
+    assert homoglyph_attack_signal("paypal.net") is None
+
+
+def test_domain_signals_many_bounds_concurrency(monkeypatch):
+    import asyncio
+
+    from backend.heuristics import domain_heuristics
+
+    active = [0]
+    peak = [0]
+    calls = []
+
+    async def fake(domain):
+        calls.append(domain)
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.01)
+        active[0] -= 1
+        return [domain]
+
+    monkeypatch.setattr(domain_heuristics, "domain_signals_async", fake)
+
+    domains = [f"d{i}.com" for i in range(10)] + ["d0.com"]
+    out = asyncio.run(domain_heuristics.domain_signals_many(domains, concurrency=3))
+    assert out == {d: [d] for d in domains}
+    assert len(calls) == 10
+    assert peak[0] <= 3
+
+
+def test_reputable_domain_skips_lookups(monkeypatch):
+    from backend.heuristics import domain_heuristics
+
+    def boom(domain):
+        raise AssertionError("network lookup for a reputable domain")
+
+    monkeypatch.setattr(domain_heuristics, "dns_overview", boom)
+    monkeypatch.setattr(domain_heuristics, "domain_age_days", boom)
+
+    names = [s["name"] for s in domain_heuristics.domain_signals("www.google.com")]
+    assert names == ["Top-Tier Reputable Domain"]
+
+
+def test_typosquatting_index_matches_scan():
+    from backend.heuristics.domain_heuristics import _scan_typo, typosquatting_signal
+
+    for domain, expected in [
+        ("gogle.com", ("google", "omission")),
+        ("gooogle.com", ("google", "repetition")),
+        ("goolge.com", ("google", "transposition")),
+        ("paypa1.com", ("paypal", "bit_flip")),
+        ("example.com", None),
+    ]:
+        sld = domain.split(".")[0]
+        assert _scan_typo(sld) == expected
+        sig = typosquatting_signal(domain, is_reputable=False)
+        assert (sig and (sig["evidence"]["brand"], sig["evidence"]["type"])) == expected
+
+
+def test_reputation_dataset_lookup(tmp_path, monkeypatch):
+    from backend.utils.reputation import reputation_service
+
+    monkeypatch.setattr(reputation_service, "_top_hashes", reputation_service._top_hashes)
+    monkeypatch.setattr(reputation_service, "_status", dict(reputation_service._status))
+
+    dataset = tmp_path / "top.txt"
+    dataset.write_text("google.com\nExample.org\n\nbbc.co.uk\ngoogle.com\n", encoding="utf-8")
+
+    # The second load is served from the digest sidecar written by the first.
+    for _ in range(2):
+        reputation_service.load_dataset(str(dataset))
+        assert reputation_service.get_status()["count"] == 3
+        assert reputation_service.is_reputable("https://www.example.org/login")
+        assert reputation_service.is_reputable("news.bbc.co.uk")
+        assert not reputation_service.is_reputable("google.co")
+        assert reputation_service.are_reputable(["WWW.EXAMPLE.ORG.", "google.co", "news.bbc.co.uk"]) == [
+            True,
+            False,
+            True,
+        ]
+    assert (tmp_path / "top.txt.u64").exists()
+
+    # A replacement dataset with an older, preserved mtime (cp -p, rsync) must not reuse the sidecar.
+    st = dataset.stat()
+    dataset.write_text("example.net\n", encoding="utf-8")
+    os.utime(dataset, ns=(st.st_atime_ns, st.st_mtime_ns - 10**9))
+    reputation_service.load_dataset(str(dataset))
+    assert reputation_service.get_status()["count"] == 1
+    assert reputation_service.is_reputable("example.net")
+    assert not reputation_service.is_reputable("example.org")
@@ -0,0 +1,51 @@
+import asyncio
+import socket
+
+from backend.heuristics import ip_heuristics
+
+
+def _fake_rdap(ip):
+    return {"asn": "64500", "asn_description": "EXAMPLE-VPN HOSTING, NL", "network": {"name": "EX"}, "asn_country_code": "nl"}
+
+
+def test_ip_signals_async_shares_lookups(monkeypatch):
+    monkeypatch.setattr(ip_heuristics, "_rdap_lookup", _fake_rdap)
+    monkeypatch.setattr(ip_heuristics, "_reverse_dns", lambda ip: "tor-exit.example.net")
+
+    sigs = asyncio.run(ip_heuristics.ip_signals_async("203.0.113.7"))
+    by_name = {s["name"]: s for s in sigs}
+    assert by_name["ASN / ISP Type"]["impact"] == 10
+    assert by_name["Country Risk"]["evidence"] == {"country_code": "NL"}
+    assert by_name["TOR/VPN Indicators"]["evidence"]["hits"] == ["tor", "vpn"]
+
+
+def test_rdap_failure_degrades_per_signal(monkeypatch):
+    def boom(ip):
+        raise RuntimeError("rdap down")
+
+    monkeypatch.setattr(ip_heuristics, "_rdap_lookup", boom)
+    monkeypatch.setattr(ip_heuristics, "_reverse_dns", lambda ip: None)
+
+    sigs = asyncio.run(ip_heuristics.ip_signals_many(["203.0.113.7", "203.0.113.7"]))
+    assert list(sigs) == ["203.0.113.7"]
+    by_name = {s["name"]: s for s in sigs["203.0.113.7"]}
+    assert by_name["Country Risk"]["evidence"] == {"error": "rdap down"}
+    assert by_name["TOR/VPN Indicators"]["impact"] == 0
+
+
+def test_reverse_dns_retries_transient_failures(monkeypatch):
+    calls = []
+
+    def lookup(ip):
+        calls.append(ip)
+        raise socket.timeout("timed out") if ip == "192.0.2.1" else socket.herror(1, "Unknown host")
+
+    monkeypatch.setattr(ip_heuristics.socket, "gethostbyaddr", lookup)
+    ip_heuristics._reverse_dns_cached.cache_clear()
+    try:
+        for _ in range(2):
+            assert ip_heuristics._reverse_dns("192.0.2.1") is None
+            assert ip_heuristics._reverse_dns("192.0.2.2") is None
+    finally:
+        ip_heuristics._reverse_dns_cached.cache_clear()
+    assert calls == ["192.0.2.1", "192.0.2.2", "192.0.2.1"]
@@ -0,0 +1,33 @@
+from backend.persistence import lookup_cache
+from backend.persistence.lookup_cache import LookupCache
+
+
+def test_lookup_cache_round_trip_and_expiry(tmp_path, monkeypatch):
+    monkeypatch.setenv("SECURITY_ANALYZER_LOOKUP_CACHE_PATH", str(tmp_path / "lookups.sqlite3"))
+    now = [1000.0]
+    monkeypatch.setattr("backend.persistence.lookup_cache.time.time", lambda: now[0])
+
+    cache = LookupCache("rdap", ttl_seconds=60)
+    cache.set("192.0.2.1", {"asn": "64500", "network": {"name": "EX"}})
+    assert cache.get("192.0.2.1") == {"asn": "64500", "network": {"name": "EX"}}
+    assert LookupCache("rdns", ttl_seconds=60).get("192.0.2.1") is None
+
+    now[0] += 61
+    assert cache.get("192.0.2.1") is None
+
+
+def test_zero_ttl_disables_lookup_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SECURITY_ANALYZER_LOOKUP_CACHE_PATH", str(tmp_path / "lookups.sqlite3"))
+    cache = LookupCache("rdap", ttl_seconds=0)
+    cache.set("192.0.2.1", {"asn": "64500"})
+    assert cache.get("192.0.2.1") is None
+
+
+def test_corrupt_row_is_a_miss():
+    cache = LookupCache("rdap", ttl_seconds=60)
+    cache.set("192.0.2.1", {"asn": "64500"})
+    with lookup_cache._lock:
+        conn = lookup_cache._connection()
+        conn.execute("UPDATE lookup_cache SET value_json = '{not json' WHERE key = '192.0.2.1'")
+        conn.commit()
+    assert cache.get("192.0.2.1", "miss") == "miss"
@@ -1,6 +1,16 @@
-﻿import os
+﻿import asyncio
+import os
 
-from backend.persistence.sqlite_store import clear_history, get_explain, init_db, list_history, save_analysis
+from backend.persistence.sqlite_store import (
+    clear_history,
+    enqueue_analysis,
+    get_explain,
+    init_db,
+    list_history,
+    save_analysis,
+    start_writer,
+    stop_writer,
+)
 
 
 def test_sqlite_persistence_roundtrip(tmp_path, monkeypatch):
@@ -25,6 +35,8 @@ def test_sqlite_persistence_roundtrip(tmp_path, monkeypatch):
     hist = list_history(limit=10)
     assert hist
     assert hist[0]["id"] == analysis_id
+    assert hist[0]["breakdown"] == result["breakdown"]
+    assert hist[0]["signals"] == []
 
     detail = get_explain(analysis_id)
     assert detail
@@ -33,3 +45,26 @@ def test_sqlite_persistence_roundtrip(tmp_path, monkeypatch):
 
     clear_history()
     assert list_history(limit=10) == []
+
+
+def test_background_writer_flushes_on_stop(tmp_path, monkeypatch):
+    monkeypatch.setenv("SECURITY_ANALYZER_DB_PATH", str(tmp_path / "test.sqlite3"))
+    init_db()
+
+    def result(i):
+        return {"target": f"example{i}.com", "type": "domain", "risk_score": i, "confidence": 0.5, "verdict": "SAFE"}
+
+    async def run():
+        await start_writer()
+        ids = [enqueue_analysis(result=result(i), explain={"signals": []}) for i in range(100)]
+        await stop_writer()
+        return ids
+
+    assert asyncio.run(run()) == [None] * 100
+
+    hist = list_history(limit=500)
+    assert len(hist) == 100
+    assert hist[0]["target"] == "example99.com"
+
+    # With no writer running, analyses are written inline and get an id straight away.
+    assert isinstance(enqueue_analysis(result=result(0), explain={}), int)
@@ -1,7 +1,9 @@
 ﻿import json
 
 from backend.core.scorer import score_signals_detailed
-from backend.core.weights import load_weights
+from backend.core.signal import Signal
+from backend.core.verdict import MALICIOUS, SAFE, SUSPICIOUS, verdict_for_score
+from backend.core.weights import load_weights, reload_weights
 
 
 def test_score_ranges():
@@ -40,3 +42,60 @@ def test_weights_file_loads():
     # We keep defaults at 1.0, but the file should load and include a path.
     assert w.get("default_weight") == 1.0
     assert "by_signal" in w
+
+
+def test_reload_weights_swaps_snapshot(tmp_path, monkeypatch):
+    path = tmp_path / "weights.json"
+    path.write_text(json.dumps({"default_weight": 1.0, "by_signal": {"A": 2.0}}), encoding="utf-8")
+    signals = [{"name": "A", "bucket": "structure", "impact": 10, "confidence": 1.0, "description": "x"}]
+
+    monkeypatch.setenv("SECURITY_ANALYZER_WEIGHTS", str(path))
+    try:
+        snap = reload_weights()
+        assert snap.by_signal["A"] == 2.0
+        risk, _, _, _ = score_signals_detailed(signals)
+        assert risk == 20
+    finally:
+        monkeypatch.delenv("SECURITY_ANALYZER_WEIGHTS")
+        reload_weights()
+
+    risk, _, _, _ = score_signals_detailed(signals)
+    assert risk == 10
+
+
+def test_verdict_thresholds_and_clamping():
+    assert verdict_for_score(-10) == SAFE
+    assert verdict_for_score(29) == SAFE
+    assert verdict_for_score(30) == SUSPICIOUS
+    assert verdict_for_score(69) == SUSPICIOUS
+    assert verdict_for_score(70) == MALICIOUS
+    assert verdict_for_score(250) == MALICIOUS
+
+
+def test_signal_objects_score_like_dicts():
+    d = {
+        "name": "A",
+        "category": "url",
+        "bucket": "structure",
+        "impact": 40,
+        "confidence": 0.8,
+        "description": "x",
+        "evidence": {"k": "v"},
+    }
+    sig = Signal.from_dict(d)
+
+    assert sig.to_dict() == d
+    assert sig["name"] == "A" and sig.get("missing") is None and "impact" in sig
+    assert score_signals_detailed([sig]) == score_signals_detailed([d])
+
+
+def test_score_without_explain_matches_detailed():
+    signals = [
+        {"name": "A", "category": "url", "bucket": "structure", "impact": 30, "confidence": 0.7, "evidence": {"k": 1}},
+        {"name": "B", "category": "domain", "bucket": "reputation", "impact": -10, "confidence": 0.9},
+    ]
+    full = score_signals_detailed(signals)
+    lean = score_signals_detailed(signals, want_explain=False)
+
+    assert lean[:3] == full[:3]
+    assert lean[3] == {}
@@ -0,0 +1,83 @@
+import asyncio
+
+from backend.utils.ttl_cache import TTLCache, ttl_from_env
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("backend.utils.ttl_cache.time.monotonic", lambda: now[0])
+
+    cache = TTLCache(maxsize=4, ttl_seconds=10)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_stats_count_every_lookup_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = TTLCache(maxsize=4, ttl_seconds=60)
+    cache.set("a", 1)
+
+    def hammer(_):
+        for _ in range(2000):
+            cache.get("a")
+            cache.get("b")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(hammer, range(8)))
+
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (16000, 16000)
+    cache.clear()
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (0, 0)
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_zero_ttl_disables_cache(monkeypatch):
+    monkeypatch.setenv("SECURITY_ANALYZER_CACHE_TTL", "0")
+    cache = TTLCache(maxsize=4, ttl_seconds=ttl_from_env(3600))
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_concurrent_misses_compute_once():
+    cache = TTLCache(maxsize=4, ttl_seconds=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_compute_async("k", compute) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["value"] * 5
+    assert len(calls) == 1
+
+
+def test_cache_if_skips_rejected_values():
+    cache = TTLCache(maxsize=4, ttl_seconds=60)
+
+    async def compute():
+        return {"ok": False}
+
+    value = asyncio.run(cache.get_or_compute_async("k", compute, cache_if=lambda v: v["ok"]))
+    assert value == {"ok": False}
+    assert cache.get("k") is None
+
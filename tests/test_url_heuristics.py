@@ -7,6 +7,13 @@ def test_shortener_detection():
     assert s["impact"] > 0
 
 
+def test_shortener_subdomain_detection():
+    from backend.heuristics.url_heuristics import shortener_signal
+
+    assert shortener_signal("https://www.bit.ly/abc").impact > 0
+    assert shortener_signal("https://notbit.ly/abc").impact == 0
+
+
 def test_homograph_punycode_indicator():
     sigs = url_signals("https://xn--pple-43d.com/login")
     s = next(x for x in sigs if x["name"] == "Homograph/IDN Indicator")
@@ -17,3 +24,77 @@ def test_entropy_signal_present():
     sigs = url_signals("https://example.com/path?token=aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa")
     s = next(x for x in sigs if x["name"] == "Path/Query Entropy")
     assert "query_entropy" in s.get("evidence", {})
+
+
+def test_cert_time_parser_matches_strptime():
+    from datetime import datetime, timezone
+
+    from backend.heuristics.ssl_heuristics import _parse_cert_time
+
+    for value in ("May 26 23:59:59 2024 GMT", "Jan  1 00:00:00 2099 GMT", "Feb 29 12:30:05 2028 GMT"):
+        expected = datetime.strptime(value, "%b %d %H:%M:%S %Y %Z").replace(tzinfo=timezone.utc)
+        assert _parse_cert_time(value) == expected
+
+
+def test_certificate_lookups_are_cached(monkeypatch):
+    from backend.heuristics import ssl_heuristics
+    from backend.utils.ttl_cache import TTLCache
+
+    calls = []
+
+    def fake_fetch(hostname, timeout):
+        calls.append(hostname)
+        return {"notAfter": "Jan  1 00:00:00 2099 GMT"} if hostname.lower() == "up.example" else None
+
+    monkeypatch.setattr(ssl_heuristics, "_fetch_certificate", fake_fetch)
+    monkeypatch.setattr(ssl_heuristics, "_CERT_CACHE", TTLCache(maxsize=4, ttl_seconds=60))
+    monkeypatch.setattr(ssl_heuristics, "_CERT_FAILURES", TTLCache(maxsize=4, ttl_seconds=60))
+
+    for _ in range(3):
+        assert ssl_heuristics.get_certificate_info("UP.example") is not None
+        assert ssl_heuristics.get_certificate_info("down.example") is None
+    assert calls == ["UP.example", "down.example"]
+
+    stats = ssl_heuristics.cache_stats()
+    assert (stats["ok"]["size"], stats["failures"]["size"]) == (1, 1)
+
+
+def test_redirect_check_falls_back_to_get_and_keeps_no_cookies():
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from backend.heuristics.url_heuristics import redirect_count_signal
+
+    seen_cookies = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_HEAD(self):
+            self.send_response(403)  # HEAD rejected without the redirect
+            self.end_headers()
+
+        def do_GET(self):
+            seen_cookies.append(self.headers.get("Cookie"))
+            if self.path in ("/", "/a"):
+                # Consent-style redirect: skipped on later visits if the cookie were replayed.
+                self.send_response(302)
+                self.send_header("Location", "/a" if self.path == "/" else "/b")
+                self.send_header("Set-Cookie", "consent=1; Path=/")
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        for _ in range(2):
+            assert redirect_count_signal(url).evidence == {"redirects": 2}
+    finally:
+        server.shutdown()
+        server.server_close()
+    # Each check starts without cookies from earlier checks.
+    assert seen_cookies[0] is None and seen_cookies[3] is None
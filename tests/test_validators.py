@@ -1,4 +1,6 @@
-﻿from backend.utils.validators import detect_target_type
+﻿import pytest
+
+from backend.utils.validators import detect_target_type, is_ip, parse_url_loose
 
 
 def test_detect_ip():
@@ -7,12 +9,27 @@ def test_detect_ip():
     assert norm == "8.8.8.8"
 
 
+def test_is_ip_shapes():
+    assert is_ip("2001:db8::1")
+    assert is_ip("fe80::1%eth0")
+    assert is_ip("::ffff:192.0.2.1")
+    assert not is_ip("256.1.1.1")
+    assert not is_ip("example.com")
+    assert not is_ip("deadbeef")
+
+
 def test_detect_domain():
     t, norm = detect_target_type("Example.COM")
     assert t == "domain"
     assert norm == "example.com"
 
 
+def test_detect_unicode_domain_is_punycoded():
+    t, norm = detect_target_type("Bücher.example.")
+    assert t == "domain"
+    assert norm == "xn--bcher-kva.example"
+
+
 def test_detect_url_scheme_less():
     t, norm = detect_target_type("example.com/path")
     assert t == "url"
@@ -23,3 +40,24 @@ def test_detect_url_with_scheme():
     t, norm = detect_target_type("https://example.com/path")
     assert t == "url"
     assert norm.startswith("https://")
+
+
+def test_parse_url_loose_components():
+    p = parse_url_loose("HTTPS://user@[2001:DB8::1]:8443/a/b?q=1#frag")
+    assert p.url.startswith("HTTPS://")
+    assert p.scheme == "https"
+    assert p.host == "2001:db8::1"
+    assert p.host_is_ip
+    assert (p.path, p.query, p.fragment) == ("/a/b", "q=1", "frag")
+
+
+def test_parse_url_loose_idna_host():
+    p = parse_url_loose("http://BÜCHER.example/")
+    assert p.host == "bücher.example"
+    assert p.host_ascii == "xn--bcher-kva.example"
+    assert not p.host_is_ip
+
+
+def test_parse_url_loose_requires_host():
+    with pytest.raises(ValueError):
+        parse_url_loose("http:///path")
@@ -0,0 +1,77 @@
+import asyncio
+
+from backend.utils import whois_utils
+
+REGISTRY = """   Domain Name: EXAMPLE-SHOP.COM
+   Registrar WHOIS Server: whois.registrar.test
+   Creation Date: 2021-03-04T05:06:07Z
+   Registrar: Example Registrar, Inc.
+"""
+
+
+def test_async_whois_follows_iana_and_referral(monkeypatch):
+    answers = {
+        ("com", "whois.iana.org"): "refer: whois.verisign-grs.com\nwhois:        whois.verisign-grs.com\n",
+        ("example-shop.com", "whois.verisign-grs.com"): REGISTRY,
+        ("example-shop.com", "whois.registrar.test"): "Registrant Country: US\n",
+    }
+    queries = []
+
+    async def fake_query(query, host, many_results=False):
+        queries.append((query, host))
+        return answers[(query, host)]
+
+    monkeypatch.setattr(whois_utils, "_whois_query", fake_query)
+    monkeypatch.setattr(whois_utils, "_IANA_SERVERS", {})
+
+    summary = asyncio.run(whois_utils._whois_lookup_async("shop.example-shop.com"))
+    assert summary["ok"]
+    assert summary["registrar"] == "Example Registrar, Inc."
+    assert summary["creation_date"].year == 2021
+    assert queries == list(answers)
+
+    # The TLD's server is remembered, so the next lookup skips IANA.
+    queries.clear()
+    asyncio.run(whois_utils._whois_lookup_async("example-shop.com"))
+    assert ("com", "whois.iana.org") not in queries
+
+
+def test_async_whois_failure_is_reported(monkeypatch):
+    async def unreachable(query, host, many_results=False):
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(whois_utils, "_whois_query", unreachable)
+    monkeypatch.setattr(whois_utils, "_IANA_SERVERS", {})
+
+    summary = asyncio.run(whois_utils._whois_lookup_async("example.com"))
+    assert summary == {"ok": False, "error": "connection refused"}
+
+
+def test_async_whois_falls_back_to_thread_on_unknown_client(monkeypatch):
+    monkeypatch.setattr(whois_utils, "_async_client_supported", lambda: False)
+    monkeypatch.setattr(whois_utils, "_whois_lookup", lambda domain: {"ok": True, "registrar": "R"})
+
+    assert asyncio.run(whois_utils._whois_lookup_async("example.com")) == {"ok": True, "registrar": "R"}
+
+
+def test_whois_summary_survives_restart_via_disk(tmp_path, monkeypatch):
+    from datetime import datetime, timezone
+
+    from backend.utils.ttl_cache import TTLCache
+
+    monkeypatch.setenv("SECURITY_ANALYZER_LOOKUP_CACHE_PATH", str(tmp_path / "lookups.sqlite3"))
+    monkeypatch.setattr(whois_utils, "_WHOIS_CACHE", TTLCache(maxsize=4, ttl_seconds=60))
+
+    created = datetime(2021, 3, 4, 5, 6, 7, tzinfo=timezone.utc)
+    calls = []
+
+    def lookup(domain):
+        calls.append(domain)
+        return {"ok": True, "creation_date": created, "registrar": "Example Registrar"}
+
+    monkeypatch.setattr(whois_utils, "_whois_lookup", lookup)
+    first = whois_utils.whois_summary("Example.com")
+
+    whois_utils._WHOIS_CACHE.clear()  # simulate a fresh process
+    assert whois_utils.whois_summary("example.com") == first
+    assert calls == ["Example.com"]